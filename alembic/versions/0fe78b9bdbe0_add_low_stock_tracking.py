@@ -0,0 +1,69 @@
+"""add low stock tracking
+
+Revision ID: 0fe78b9bdbe0
+Revises: 8e0deaafa328
+Create Date: 2026-10-18 15:02:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0fe78b9bdbe0'
+down_revision: Union[str, Sequence[str], None] = '8e0deaafa328'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('low_stock',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('since', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_table('low_stock_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('event', sa.Enum('ENTERED', 'LEFT', name='lowstockeventtype'), nullable=False),
+    sa.Column('current_stock', sa.Float(), nullable=False),
+    sa.Column('min_quantity', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_low_stock_events_product_id_id', 'low_stock_events', ['product_id', 'id'], unique=False)
+
+    # seed the set from the current balances; every product already below its
+    # threshold gets an ENTERED event so feed consumers start from a full picture
+    op.execute(
+        """
+        INSERT INTO low_stock (product_id)
+        SELECT b.product_id
+        FROM stock_balances b
+        JOIN products p ON p.id = b.product_id
+        WHERE b.quantity < COALESCE(p.min_quantity, 0)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO low_stock_events (product_id, event, current_stock, min_quantity)
+        SELECT b.product_id, 'ENTERED', b.quantity, COALESCE(p.min_quantity, 0)
+        FROM low_stock l
+        JOIN stock_balances b ON b.product_id = l.product_id
+        JOIN products p ON p.id = l.product_id
+        ORDER BY l.product_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_low_stock_events_product_id_id', table_name='low_stock_events')
+    op.drop_table('low_stock_events')
+    op.drop_table('low_stock')
+    sa.Enum(name='lowstockeventtype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""add report generation sequence
+
+Revision ID: 6a2d94e0b7c5
+Revises: c81e5a3f6b27
+Create Date: 2026-10-19 09:14:27.630581
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d94e0b7c5'
+down_revision: Union[str, Sequence[str], None] = 'c81e5a3f6b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('report_generation')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('report_generation')))
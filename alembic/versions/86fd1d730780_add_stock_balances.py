@@ -0,0 +1,46 @@
+"""add stock balances
+
+Revision ID: 86fd1d730780
+Revises: 165d88aac088
+Create Date: 2026-10-18 09:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '86fd1d730780'
+down_revision: Union[str, Sequence[str], None] = '165d88aac088'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_balances',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+    # backfill one balance row per product from the existing ledger
+    op.execute(
+        """
+        INSERT INTO stock_balances (product_id, quantity)
+        SELECT p.id,
+               COALESCE(SUM(CASE WHEN i.change_type = 'IN' THEN i.quantity ELSE -i.quantity END), 0)
+        FROM products p
+        LEFT JOIN inventory i ON i.product_id = p.id
+        GROUP BY p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_balances')
@@ -0,0 +1,51 @@
+"""add inventory daily rollup
+
+Revision ID: 8e0deaafa328
+Revises: ad7b98847272
+Create Date: 2026-10-18 13:41:09.662870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e0deaafa328'
+down_revision: Union[str, Sequence[str], None] = 'ad7b98847272'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inventory_daily_rollup',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('in_qty', sa.Float(), nullable=False),
+    sa.Column('out_qty', sa.Float(), nullable=False),
+    sa.Column('movement_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'day')
+    )
+    op.create_index('ix_inventory_daily_rollup_day', 'inventory_daily_rollup', ['day'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO inventory_daily_rollup (product_id, day, in_qty, out_qty, movement_count)
+        SELECT product_id,
+               (created_at AT TIME ZONE 'UTC')::date,
+               COALESCE(SUM(quantity) FILTER (WHERE change_type = 'IN'), 0),
+               COALESCE(SUM(quantity) FILTER (WHERE change_type = 'OUT'), 0),
+               COUNT(*)
+        FROM inventory
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_daily_rollup_day', table_name='inventory_daily_rollup')
+    op.drop_table('inventory_daily_rollup')
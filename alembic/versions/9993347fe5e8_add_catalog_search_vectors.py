@@ -0,0 +1,54 @@
+"""add catalog search vectors
+
+Revision ID: 9993347fe5e8
+Revises: b5e1655ef397
+Create Date: 2026-10-18 18:02:11.306158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9993347fe5e8'
+down_revision: Union[str, Sequence[str], None] = 'b5e1655ef397'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# written out rather than built with app.core.search.search_vector_sql, so
+# later changes there never alter what this revision creates
+_NAME = "setweight(to_tsvector('simple', coalesce(name, '')), 'A')"
+_SKU = "setweight(to_tsvector('simple', coalesce(sku, '')), 'A')"
+_DESCRIPTION = "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+
+SEARCH_VECTORS = {
+    'products': f"{_NAME} || {_SKU} || {_DESCRIPTION}",
+    'categories': f"{_NAME} || {_DESCRIPTION}",
+    'suppliers': f"{_NAME} || {_DESCRIPTION}",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # adding a stored generated column rewrites each table once
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_products_sku_lower_prefix', 'products', [sa.text('lower(sku) text_pattern_ops')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_products_sku_lower_prefix', table_name='products', postgresql_concurrently=True, if_exists=True)
+        for table in SEARCH_VECTORS:
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in SEARCH_VECTORS:
+        op.drop_column(table, 'search_vector')
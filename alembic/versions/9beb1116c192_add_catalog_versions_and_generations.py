@@ -0,0 +1,73 @@
+"""add catalog versions and generations
+
+Revision ID: 9beb1116c192
+Revises: 9993347fe5e8
+Create Date: 2026-10-18 18:31:47.204915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9beb1116c192'
+down_revision: Union[str, Sequence[str], None] = '9993347fe5e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the tables this revision adds triggers to; app.core.generations may watch
+# more later, in a revision of its own
+GENERATION_TABLES = ("products", "categories", "suppliers")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a constant default is stored in the catalog, so no table rewrite
+    for table in GENERATION_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    op.create_table(
+        'table_generations',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('generation', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.execute(
+        sa.text("INSERT INTO table_generations (table_name) VALUES "
+                + ", ".join(f"('{table}')" for table in GENERATION_TABLES))
+    )
+
+    # statement-level, so a bulk write bumps once; the row lock it takes
+    # serializes writers to the same table, which catalog write rates allow
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_generation() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_generations (table_name, generation) VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name) DO UPDATE SET generation = table_generations.generation + 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in GENERATION_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_generation()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in GENERATION_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_generation ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_generation()")
+    op.drop_table('table_generations')
+
+    for table in GENERATION_TABLES:
+        op.drop_column(table, 'version')
@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: ad7b98847272
+Revises: f13452d25ccb
+Create Date: 2026-10-18 11:26:54.094117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad7b98847272'
+down_revision: Union[str, Sequence[str], None] = 'f13452d25ccb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # (created_at, id) serves both the plain created_at ordering and keyset pages
+        op.create_index('ix_inventory_created_at_id', 'inventory', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_inventory_created_at', table_name='inventory', postgresql_concurrently=True, if_exists=True)
+        op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+        op.create_index('ix_inventory_created_at', 'inventory', ['created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_inventory_created_at_id', table_name='inventory', postgresql_concurrently=True, if_exists=True)
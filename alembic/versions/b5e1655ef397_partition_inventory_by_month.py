@@ -0,0 +1,178 @@
+"""partition inventory by month
+
+Revision ID: b5e1655ef397
+Revises: c4b22d0e320e
+Create Date: 2026-10-18 17:05:21.774390
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1655ef397'
+down_revision: Union[str, Sequence[str], None] = 'c4b22d0e320e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+BATCH_SIZE = 50000
+
+COLUMNS = "id, product_id, change_type, quantity, user_id, supplier_id, description, created_at"
+
+# (name, columns, INCLUDE columns, WHERE)
+INDEXES = [
+    ("ix_inventory_product_id_created_at", "product_id, created_at", "change_type, quantity", None),
+    ("ix_inventory_change_type_created_at", "change_type, created_at", "product_id, quantity", None),
+    ("ix_inventory_created_at_id", "created_at, id", None, None),
+    ("ix_inventory_user_id_created_at", "user_id, created_at", None, None),
+    ("ix_inventory_supplier_id_created_at", "supplier_id, created_at", None, "supplier_id IS NOT NULL"),
+]
+FOREIGN_KEYS = [
+    ("inventory_product_id_fkey", "product_id", "products"),
+    ("inventory_supplier_id_fkey", "supplier_id", "suppliers"),
+    ("inventory_user_id_fkey", "user_id", "users"),
+]
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    foreign_keys = ",\n".join(
+        f"CONSTRAINT {fk} FOREIGN KEY ({column}) REFERENCES {target} (id)"
+        for fk, column, target in FOREIGN_KEYS
+    )
+    op.execute(
+        f"""
+        CREATE TABLE {name} (
+            id INTEGER NOT NULL DEFAULT nextval('inventory_id_seq'),
+            product_id INTEGER NOT NULL,
+            change_type changetype NOT NULL,
+            quantity DOUBLE PRECISION NOT NULL,
+            user_id INTEGER NOT NULL,
+            supplier_id INTEGER,
+            description VARCHAR,
+            created_at TIMESTAMP WITH TIME ZONE {'NOT NULL ' if partitioned else ''}DEFAULT now(),
+            CONSTRAINT inventory_pkey PRIMARY KEY ({'id, created_at' if partitioned else 'id'}),
+            {foreign_keys}
+        ){' PARTITION BY RANGE (created_at)' if partitioned else ''}
+        """
+    )
+    for index, columns, include, where in INDEXES:
+        op.execute(
+            f"CREATE INDEX {index} ON {name} ({columns})"
+            + (f" INCLUDE ({include})" if include else "")
+            + (f" WHERE {where}" if where else "")
+        )
+
+
+def _create_month_partitions(parent: str, prefix: str, oldest: datetime | None) -> None:
+    """One child per month from oldest through MONTHS_AHEAD months from now.
+
+    Spelled out here rather than taken from app.core.partitions, so later
+    changes there never alter what this revision does.
+    """
+    now = datetime.now(timezone.utc)
+    first = oldest or now
+    month = first.year * 12 + first.month - 1
+    last = now.year * 12 + now.month - 1 + MONTHS_AHEAD
+    while month <= last:
+        lower = date(month // 12, month % 12 + 1, 1)
+        upper = date((month + 1) // 12, (month + 1) % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE {prefix}_p{lower:%Y%m} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{lower} 00:00:00+00') TO ('{upper} 00:00:00+00')"
+        )
+        month += 1
+
+
+def _rename_legacy(table: str, suffix: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT inventory_pkey TO inventory_{suffix}_pkey")
+    for index, *_ in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The ledger stays writable while it is copied: a trigger mirrors new rows
+    into the partitioned table, existing rows are copied in committed
+    batches, and only the final swap takes a short exclusive lock.
+    """
+    bind = op.get_bind()
+
+    # free the index and constraint names for the new table
+    _rename_legacy("inventory", "legacy")
+    _create_table("inventory_partitioned", partitioned=True)
+    op.execute("CREATE TABLE inventory_default PARTITION OF inventory_partitioned DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM inventory")).scalar()
+    _create_month_partitions("inventory_partitioned", "inventory", oldest)
+
+    # The partition key is (id, created_at), so ON CONFLICT only catches a row
+    # copied twice if both copies carry the same created_at. The trigger runs
+    # before the insert and fills a missing created_at on the legacy row
+    # itself, and the UPDATE fills the rows already stored; from then on the
+    # mirror and the batched copy read the same timestamp.
+    op.execute(
+        f"""
+        CREATE FUNCTION inventory_mirror_insert() RETURNS trigger AS $$
+        BEGIN
+            NEW.created_at := COALESCE(NEW.created_at, now());
+            INSERT INTO inventory_partitioned ({COLUMNS})
+            VALUES (NEW.id, NEW.product_id, NEW.change_type, NEW.quantity, NEW.user_id,
+                    NEW.supplier_id, NEW.description, NEW.created_at)
+            ON CONFLICT DO NOTHING;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_mirror_insert BEFORE INSERT ON inventory
+        FOR EACH ROW EXECUTE FUNCTION inventory_mirror_insert()
+        """
+    )
+    op.execute("UPDATE inventory SET created_at = now() WHERE created_at IS NULL")
+
+    copy_batch = sa.text(
+        f"""
+        INSERT INTO inventory_partitioned ({COLUMNS})
+        SELECT {COLUMNS}
+        FROM inventory
+        WHERE id >= :lower AND id < :upper
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        # the trigger is committed from here on, so every row past max_id is mirrored
+        lower, max_id = bind.execute(sa.text("SELECT min(id), max(id) FROM inventory")).one()
+        while lower is not None and lower <= max_id:
+            bind.execute(copy_batch, {"lower": lower, "upper": lower + BATCH_SIZE})
+            lower += BATCH_SIZE
+
+    # swap: writers wait only for the catch-up copy and the renames
+    op.execute("LOCK TABLE inventory IN ACCESS EXCLUSIVE MODE")
+    bind.execute(copy_batch, {"lower": (max_id or 0) + 1, "upper": 2 ** 31 - 1})
+    op.execute("DROP TRIGGER inventory_mirror_insert ON inventory")
+    op.execute("DROP FUNCTION inventory_mirror_insert()")
+    op.execute("ALTER TABLE inventory RENAME TO inventory_legacy")
+    op.execute("ALTER TABLE inventory_partitioned RENAME TO inventory")
+    op.execute("ALTER SEQUENCE inventory_id_seq OWNED BY inventory.id")
+    op.execute("DROP TABLE inventory_legacy")
+    op.execute("ANALYZE inventory")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE inventory IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE inventory RENAME TO inventory_partitioned")
+    _rename_legacy("inventory_partitioned", "partitioned")
+    _create_table("inventory_plain", partitioned=False)
+    op.execute(f"INSERT INTO inventory_plain ({COLUMNS}) SELECT {COLUMNS} FROM inventory_partitioned")
+    op.execute("ALTER TABLE inventory_plain RENAME TO inventory")
+    op.execute("ALTER SEQUENCE inventory_id_seq OWNED BY inventory.id")
+    op.execute("DROP TABLE inventory_partitioned")
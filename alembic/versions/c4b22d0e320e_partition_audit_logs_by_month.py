@@ -0,0 +1,124 @@
+"""partition audit_logs by month
+
+Revision ID: c4b22d0e320e
+Revises: 0fe78b9bdbe0
+Create Date: 2026-10-18 16:12:48.530917
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b22d0e320e'
+down_revision: Union[str, Sequence[str], None] = '0fe78b9bdbe0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, user_id, action, entity, entity_id, old_data, new_data, created_at"
+
+
+def _create_month_partitions(parent: str, oldest: datetime | None) -> None:
+    """One child per month from oldest through MONTHS_AHEAD months from now.
+
+    Spelled out here rather than taken from app.core.partitions, so later
+    changes there never alter what this revision does.
+    """
+    now = datetime.now(timezone.utc)
+    first = oldest or now
+    month = first.year * 12 + first.month - 1
+    last = now.year * 12 + now.month - 1 + MONTHS_AHEAD
+    while month <= last:
+        lower = date(month // 12, month % 12 + 1, 1)
+        upper = date((month + 1) // 12, (month + 1) % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE {parent}_p{lower:%Y%m} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{lower} 00:00:00+00') TO ('{upper} 00:00:00+00')"
+        )
+        month += 1
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # audit_logs is rewritten into a partitioned table of the same name; the
+    # copy runs inside the migration transaction, so writes wait for it
+    op.execute("LOCK TABLE audit_logs IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_user_id_fkey TO audit_logs_legacy_user_id_fkey")
+    op.drop_index('ix_audit_logs_id', table_name='audit_logs_legacy')
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs_legacy', if_exists=True)
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER CONSTRAINT audit_logs_user_id_fkey REFERENCES users (id),
+            action VARCHAR NOT NULL,
+            entity VARCHAR NOT NULL,
+            entity_id INTEGER,
+            old_data JSON,
+            new_data JSON,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_legacy")).scalar()
+    _create_month_partitions("audit_logs", oldest)
+
+    op.execute(
+        f"""
+        INSERT INTO audit_logs ({COLUMNS})
+        SELECT id, user_id, action, entity, entity_id, old_data, new_data, COALESCE(created_at, now())
+        FROM audit_logs_legacy
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.drop_table('audit_logs_legacy')
+
+    # created on the parent, so every current and future partition gets them
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_entity_entity_id_created_at', 'audit_logs', ['entity', 'entity_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_user_id_created_at', 'audit_logs', ['user_id', 'created_at', 'id'], unique=False)
+    op.execute("ANALYZE audit_logs")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE audit_logs IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_user_id_fkey TO audit_logs_partitioned_user_id_fkey")
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs_partitioned')
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER CONSTRAINT audit_logs_user_id_fkey REFERENCES users (id),
+            action VARCHAR NOT NULL,
+            entity VARCHAR NOT NULL,
+            entity_id INTEGER,
+            old_data JSON,
+            new_data JSON,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+
+    op.create_index('ix_audit_logs_id', 'audit_logs', ['id'], unique=False)
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'], unique=False)
@@ -0,0 +1,41 @@
+"""add auth cleanup indexes
+
+Revision ID: c81e5a3f6b27
+Revises: 4f0c2d7a9e13
+Create Date: 2026-10-18 21:48:33.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81e5a3f6b27'
+down_revision: Union[str, Sequence[str], None] = '4f0c2d7a9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns); ix_refresh_tokens_user_active was declared on the
+# model from the start but never created
+INDEXES = [
+    ('ix_refresh_tokens_user_active', 'refresh_tokens', ['user_id', 'revoked']),
+    ('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at']),
+    ('ix_login_attempts_created_at', 'login_attempts', ['created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: logins keep writing both tables while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
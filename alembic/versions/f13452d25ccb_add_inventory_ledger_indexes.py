@@ -0,0 +1,50 @@
+"""add inventory ledger indexes
+
+Revision ID: f13452d25ccb
+Revises: 86fd1d730780
+Create Date: 2026-10-18 10:03:27.551942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f13452d25ccb'
+down_revision: Union[str, Sequence[str], None] = '86fd1d730780'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_inventory_product_id_created_at', ['product_id', 'created_at'], {'postgresql_include': ['change_type', 'quantity']}),
+    ('ix_inventory_change_type_created_at', ['change_type', 'created_at'], {'postgresql_include': ['product_id', 'quantity']}),
+    ('ix_inventory_created_at', ['created_at'], {}),
+    ('ix_inventory_user_id_created_at', ['user_id', 'created_at'], {}),
+    ('ix_inventory_supplier_id_created_at', ['supplier_id', 'created_at'], {'postgresql_where': sa.text('supplier_id IS NOT NULL')}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the ledger writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                'inventory',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='inventory', postgresql_concurrently=True, if_exists=True)
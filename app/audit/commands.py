@@ -0,0 +1,42 @@
+"""Maintenance commands for the partitioned audit log.
+
+Usage:
+    python -m app.audit.commands ensure-partitions [--months-ahead N]
+    python -m app.audit.commands retention [--keep-months N] [--dry-run]
+"""
+import argparse
+import sys
+
+import app.db.base  # noqa: F401  (registers every model with the mapper)
+from app.audit.service import drop_expired_audit_partitions, ensure_audit_partitions
+from app.core.config import settings
+from app.core.database import engine
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.audit.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure-partitions", help="create monthly partitions up to N months ahead")
+    ensure.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    retention = sub.add_parser("retention", help="detach and drop partitions past the retention window")
+    retention.add_argument("--keep-months", type=int, default=settings.AUDIT_RETENTION_MONTHS)
+    retention.add_argument("--dry-run", action="store_true", help="only list the partitions that would be dropped")
+    args = parser.parse_args(argv)
+
+    with engine.begin() as conn:
+        if args.command == "ensure-partitions":
+            created = ensure_audit_partitions(conn, months_ahead=args.months_ahead)
+            for name in created:
+                print(f"created {name}")
+            print(f"{len(created)} partitions created")
+            return 0
+
+        dropped = drop_expired_audit_partitions(conn, keep_months=args.keep_months, dry_run=args.dry_run)
+        for name in dropped:
+            print(f"{'would drop' if args.dry_run else 'dropped'} {name}")
+        print(f"{len(dropped)} partitions {'expired' if args.dry_run else 'dropped'}")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
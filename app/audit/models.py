@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -7,7 +7,8 @@ class AuditLog(Base):
 
     __tablename__ = "audit_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # partitioned by created_at, which therefore has to be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
@@ -20,4 +21,13 @@ class AuditLog(Base):
     old_data = Column(JSON, nullable=True)
     new_data = Column(JSON, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+
+    __table_args__ = (
+        # keyset pagination on (created_at, id)
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        # entity timelines and per-user history; id keeps keyset pages in the index
+        Index("ix_audit_logs_entity_entity_id_created_at", "entity", "entity_id", "created_at", "id"),
+        Index("ix_audit_logs_user_id_created_at", "user_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
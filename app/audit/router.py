@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.audit.models import AuditLog
 from app.core.dependencies import require_role
-from app.common.enums import Role
+from app.common.enums import Role, ExportFormat
 from app.core.dependencies import pagination_params,sorting_params
 from app.audit import service
 
@@ -18,13 +18,15 @@ router = APIRouter(
 
 @router.get("/")
 def list_audit_logs(
+    response: Response,
     user_id: int | None = None,
     entity: str | None = None,
+    cursor: str | None = Query(None, description="Keyset pagination; pass an empty value to start"),
     db: Session = Depends(get_db),
     pagination: dict = Depends(pagination_params),
     sorting: dict = Depends(sorting_params),
 ):
-    return service.get_audit_logs(
+    items, next_cursor = service.get_audit_logs(
         db=db,
         page=pagination["page"],
         page_size=pagination["page_size"],
@@ -33,4 +35,48 @@ def list_audit_logs(
         sort_order=sorting["sort_order"],
         user_id=user_id,
         entity=entity,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/{entity}/{entity_id}/timeline")
+def entity_timeline(
+    response: Response,
+    entity: str,
+    entity_id: int,
+    cursor: str | None = Query(None, description="Next-page cursor from X-Next-Cursor"),
+    page_size: int = Query(20, ge=1, le=100),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_db),
+):
+    items, next_cursor = service.get_entity_timeline(
+        db=db,
+        entity=entity,
+        entity_id=entity_id,
+        page_size=page_size,
+        cursor=cursor,
+        sort_order=sort_order,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/export")
+def export_audit_logs(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    user_id: int | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    entity_id: int | None = None,
+):
+    return service.export_audit_logs(
+        fmt=format,
+        user_id=user_id,
+        action=action,
+        entity=entity,
+        entity_id=entity_id,
     )
@@ -1,8 +1,52 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
+from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 
 from app.audit.models import AuditLog
-from app.core.query_utils import apply_pagination, apply_sorting
+from app.audit.writer import audit_writer
+from app.common.enums import AuditMode, ExportFormat
+from app.core.config import settings
+from app.core.export import export_response
+from app.core.partitions import add_months, drop_partitions_before, ensure_partitions, month_start
+from app.core.query_utils import apply_pagination, apply_sorting, paginate_keyset
+
+_PENDING_KEY = "audit_pending"
+
+def _audit_row(entry: dict) -> dict:
+    return {
+        "user_id": entry.get("user_id"),
+        "action": entry["action"],
+        "entity": entry["entity"],
+        "entity_id": entry.get("entity_id"),
+        "old_data": jsonable_encoder(entry["old_data"]) if entry.get("old_data") is not None else None,
+        "new_data": jsonable_encoder(entry["new_data"]) if entry.get("new_data") is not None else None,
+    }
+
+def log_actions(db: Session, entries: list[dict]):
+    """Record audit rows as part of the caller's transaction (never commits).
+
+    In transactional mode the rows go out with a multi-row INSERT in that
+    transaction. In buffered mode they are held on the session and handed to
+    the background writer once it commits, and dropped if it rolls back.
+    """
+    if not entries:
+        return
+
+    rows = [_audit_row(e) for e in entries]
+
+    if settings.AUDIT_MODE == AuditMode.BUFFERED:
+        # the row is written later, so stamp the time of the action now
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row["created_at"] = now
+        db.info.setdefault(_PENDING_KEY, []).extend(rows)
+        return
+
+    db.execute(insert(AuditLog), rows)
 
 def log_action(
     db: Session,
@@ -13,33 +57,32 @@ def log_action(
     old_data: dict | None = None,
     new_data: dict | None = None,
 ):
-    old_data_json = jsonable_encoder(old_data) if old_data is not None else None
-    new_data_json = jsonable_encoder(new_data) if new_data is not None else None
-
-    log = AuditLog(
-        user_id=user_id,
-        action=action,
-        entity=entity,
-        entity_id=entity_id,
-        old_data=old_data_json,
-        new_data=new_data_json,
-    )
-    db.add(log)
-    db.commit()
+    log_actions(db, [{
+        "user_id": user_id,
+        "action": action,
+        "entity": entity,
+        "entity_id": entity_id,
+        "old_data": old_data,
+        "new_data": new_data,
+    }])
 
-def get_audit_logs(
-    db: Session,
-    page: int,
-    page_size: int,
-    offset: int,
-    sort_by: str | None = None,
-    sort_order: str = "desc",
+@event.listens_for(Session, "after_commit")
+def _submit_pending(session):
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        audit_writer.submit(rows)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+def filter_audit_logs(
+    q,
     user_id: int | None = None,
     action: str | None = None,
     entity: str | None = None,
     entity_id: int | None = None,
 ):
-    q = db.query(AuditLog)
     if user_id is not None:
         q = q.filter(AuditLog.user_id == user_id)
     if action is not None:
@@ -48,8 +91,76 @@ def get_audit_logs(
         q = q.filter(AuditLog.entity == entity)
     if entity_id is not None:
         q = q.filter(AuditLog.entity_id == entity_id)
+    return q
+
+def get_audit_logs(
+    db: Session,
+    page: int,
+    page_size: int,
+    offset: int,
+    sort_by: str | None = None,
+    sort_order: str = "desc",
+    user_id: int | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    entity_id: int | None = None,
+    cursor: str | None = None,
+):
+    """Return (items, next_cursor); next_cursor is only set in cursor mode."""
+    q = filter_audit_logs(db.query(AuditLog), user_id, action, entity, entity_id)
+
+    if cursor is not None:
+        if sort_by not in (None, "created_at"):
+            raise HTTPException(status_code=400, detail="Cursor pagination requires sort_by=created_at")
+        return paginate_keyset(q, AuditLog, cursor, page_size, sort_order)
 
     q = apply_sorting(q, AuditLog, sort_by, sort_order)
     q = apply_pagination(q, page_size=page_size, offset=offset)
 
-    return q.all()
\ No newline at end of file
+    return q.all(), None
+
+def get_entity_timeline(
+    db: Session,
+    entity: str,
+    entity_id: int,
+    page_size: int,
+    cursor: str | None = None,
+    sort_order: str = "desc",
+):
+    """One entity's audit trail, paged on ix_audit_logs_entity_entity_id_created_at."""
+    q = filter_audit_logs(db.query(AuditLog), entity=entity, entity_id=entity_id)
+    return paginate_keyset(q, AuditLog, cursor, page_size, sort_order)
+
+AUDIT_EXPORT_COLUMNS = [
+    "id", "user_id", "action", "entity", "entity_id",
+    "old_data", "new_data", "created_at",
+]
+
+def export_audit_logs(
+    fmt: ExportFormat,
+    user_id: int | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    entity_id: int | None = None,
+):
+    columns = [getattr(AuditLog, c) for c in AUDIT_EXPORT_COLUMNS]
+
+    def build_query(db):
+        q = filter_audit_logs(db.query(*columns), user_id, action, entity, entity_id)
+        return q.order_by(AuditLog.created_at.asc(), AuditLog.id.asc())
+
+    return export_response(build_query, AUDIT_EXPORT_COLUMNS, fmt, "audit_logs")
+
+def ensure_audit_partitions(conn: Connection, months_ahead: int | None = None) -> list[str]:
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    return ensure_partitions(conn, AuditLog.__tablename__, months_ahead)
+
+def drop_expired_audit_partitions(
+    conn: Connection,
+    keep_months: int | None = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Drop monthly partitions older than keep_months full months before this one."""
+    keep_months = settings.AUDIT_RETENTION_MONTHS if keep_months is None else keep_months
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -keep_months)
+    return drop_partitions_before(conn, AuditLog.__tablename__, cutoff, dry_run=dry_run)
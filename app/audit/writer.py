@@ -0,0 +1,186 @@
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.audit.models import AuditLog
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Bounded in-process queue of committed audit rows, flushed in batches.
+
+    A background thread writes a multi-row INSERT once batch_size rows are
+    waiting or flush_interval seconds after the first of them arrived. When
+    the queue is full, submit() blocks for up to enqueue_timeout seconds and
+    then writes the rows itself, so a slow database slows producers down
+    instead of dropping audit entries.
+
+    The rows describe changes that are already committed, so a batch that
+    fails on a connection error is retried with exponential backoff (retries
+    times, starting at retry_backoff seconds) before it is given up and
+    counted as failed.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        enqueue_timeout: float,
+        retries: int = 0,
+        retry_backoff: float = 0.5,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+        self.retried_flushes = 0
+        self.written_inline = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the thread and flush whatever is still queued."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            # the sentinel wakes the thread, which flushes its batch and exits
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        while rows := self._drain(self.batch_size):
+            self._flush(rows)
+
+    def submit(self, rows: list[dict]):
+        if self._thread is None:
+            self.start()
+
+        for i, row in enumerate(rows):
+            try:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            except queue.Full:
+                if self._flush(rows[i:]):
+                    with self._stats_lock:
+                        self.written_inline += len(rows) - i
+                return
+
+    def _drain(self, limit: int) -> list[dict]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                rows.append(row)
+        return rows
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            self._flush(batch)
+
+    def _flush(self, rows: list[dict]) -> bool:
+        if not rows:
+            return True
+
+        delay = self.retry_backoff
+        for attempt in range(self.retries + 1):
+            try:
+                self._insert(rows)
+                break
+            except (OperationalError, InterfaceError):
+                if attempt == self.retries:
+                    return self._give_up(rows)
+                logger.warning("retrying %d audit rows in %.1fs", len(rows), delay, exc_info=True)
+                with self._stats_lock:
+                    self.retried_flushes += 1
+                time.sleep(delay)
+                delay *= 2
+            except Exception:
+                return self._give_up(rows)
+
+        with self._stats_lock:
+            self.written += len(rows)
+            self.flushes += 1
+        return True
+
+    def _insert(self, rows: list[dict]):
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _give_up(self, rows: list[dict]) -> bool:
+        with self._stats_lock:
+            self.failed += len(rows)
+        logger.exception("failed to write %d audit rows", len(rows))
+        return False
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "mode": settings.AUDIT_MODE.value,
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "flushes": self.flushes,
+                "avg_batch_size": round(self.written / self.flushes, 2) if self.flushes else 0.0,
+                "failed": self.failed,
+                "retried_flushes": self.retried_flushes,
+                "written_inline": self.written_inline,
+            }
+
+
+audit_writer = AuditWriter(
+    max_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_FLUSH_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+    retries=settings.AUDIT_FLUSH_RETRIES,
+    retry_backoff=settings.AUDIT_FLUSH_RETRY_BACKOFF_SECONDS,
+)
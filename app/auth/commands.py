@@ -0,0 +1,284 @@
+"""Maintenance commands for the auth tables.
+
+Usage:
+    python -m app.auth.commands purge [--batch-size N] [--dry-run]
+    python -m app.auth.commands check-statements
+    python -m app.auth.commands bench-login [--logins N] [--concurrency N]
+    python -m app.auth.commands bench-tokens [--repeat N]
+"""
+import argparse
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+
+import app.db.base  # noqa: F401  (registers every model with the mapper)
+from app.auth.models import LoginAttempt, RefreshToken, TokenRevocation
+from app.common.enums import Role
+from app.core.benchmark import count_statements, format_timing, summarize, timed
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.password_pool import password_pool
+from app.core.rate_limiter import limiter
+from app.core.security import _verify_token, create_access_token, decode_access_token, hash_password, token_cache
+from app.users.models import User
+
+
+def purge_conditions(now: datetime | None = None) -> dict:
+    """What the purge removes from each table, as (model, condition)."""
+    now = now or datetime.now(timezone.utc)
+    # a refresh token's expiry is its issue time plus REFRESH_TOKEN_EXPIRE_DAYS,
+    # so "issued before the retention window" is an expires_at bound and the
+    # expires_at index serves both conditions
+    revoked_before = now + timedelta(
+        days=settings.REFRESH_TOKEN_EXPIRE_DAYS - settings.REVOKED_REFRESH_TOKEN_RETENTION_DAYS
+    )
+    return {
+        "refresh_tokens": (
+            RefreshToken,
+            or_(
+                RefreshToken.expires_at < now,
+                and_(RefreshToken.revoked.is_(True), RefreshToken.expires_at < revoked_before),
+            ),
+        ),
+        "login_attempts": (
+            LoginAttempt,
+            LoginAttempt.created_at < now - timedelta(days=settings.LOGIN_ATTEMPT_RETENTION_DAYS),
+        ),
+        "token_revocations": (TokenRevocation, TokenRevocation.expires_at < now),
+    }
+
+
+def purge_in_batches(db: Session, model, condition, batch_size: int) -> int:
+    """Delete matching rows batch_size at a time, committing after each batch.
+
+    Each batch is a short transaction, so locks are held briefly and vacuum
+    can keep up; rows locked by a concurrent login or refresh are skipped and
+    left for the next run.
+    """
+    deleted = 0
+    while True:
+        batch = (
+            select(model.id)
+            .where(condition)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(delete(model).where(model.id.in_(batch)))
+        db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def purge(db: Session, batch_size: int, dry_run: bool = False) -> dict[str, int]:
+    counts = {}
+    for table, (model, condition) in purge_conditions().items():
+        if dry_run:
+            counts[table] = db.execute(select(func.count()).select_from(model).where(condition)).scalar()
+        else:
+            counts[table] = purge_in_batches(db, model, condition, batch_size)
+    return counts
+
+
+# login and refresh promise one read and one commit each (see app/auth/router.py)
+EXPECTED_STATEMENTS = {"login": (1, 1), "refresh": (1, 1)}
+CHECK_EMAIL = "statement-check@example.invalid"
+CHECK_PASSWORD = "statement-check-password"
+
+
+def check_auth_statements(db: Session) -> dict[str, dict]:
+    """Log in and refresh a throwaway user, counting the statements of each request.
+
+    The user and everything it left behind are deleted afterwards.
+    """
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError as e:
+        raise RuntimeError("check-statements requires the 'httpx' package") from e
+    from app.main import app
+
+    user = User(email=CHECK_EMAIL, hashed_password=hash_password(CHECK_PASSWORD), role=Role.STAFF)
+    db.add(user)
+    db.commit()
+
+    client = TestClient(app)
+    results = {}
+    try:
+        with count_statements(engine) as counts:
+            response = client.post("/auth/login", data={"username": CHECK_EMAIL, "password": CHECK_PASSWORD})
+        response.raise_for_status()
+        results["login"] = counts
+
+        with count_statements(engine) as counts:
+            response = client.post("/auth/refresh", json={"refresh_token": response.json()["refresh_token"]})
+        response.raise_for_status()
+        results["refresh"] = counts
+    finally:
+        db.execute(delete(LoginAttempt).where(LoginAttempt.user_id == user.id))
+        db.execute(delete(User).where(User.id == user.id))
+        db.commit()
+    return results
+
+
+BENCH_EMAIL = "bench-login@example.invalid"
+# a cheap authenticated read that shares the worker with the logins
+PROBE_PATH = "/inventory/history?page_size=20&total=none"
+
+
+def _login_flood(client, password: str, logins: int, concurrency: int, probe) -> dict:
+    def log_in(_):
+        started = time.perf_counter()
+        response = client.post("/auth/login", data={"username": BENCH_EMAIL, "password": password})
+        return response.status_code, time.perf_counter() - started
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        futures = [pool.submit(log_in, i) for i in range(logins)]
+        probes = []
+        while not all(f.done() for f in futures):
+            t0 = time.perf_counter()
+            probe()
+            probes.append(time.perf_counter() - t0)
+        probe_elapsed = time.perf_counter() - started
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - started
+
+    succeeded = [duration for status_code, duration in results if status_code == 200]
+    return {
+        "logins": summarize(succeeded, elapsed),
+        "rejected": sum(1 for status_code, _ in results if status_code == 503),
+        "probe": summarize(probes, probe_elapsed),
+    }
+
+
+def bench_login(db: Session, logins: int = 200, concurrency: int = 16, probes: int = 200) -> dict[str, dict]:
+    """Flood /auth/login in-process and time another route meanwhile, with and without the password pool.
+
+    Rate limits are switched off for the run. Each login holds a database
+    connection while its hash is checked, so no more than DB_POOL_SIZE +
+    DB_MAX_OVERFLOW hashes are ever in flight. The throwaway user and
+    everything it left behind are deleted afterwards.
+    """
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError as e:
+        raise RuntimeError("bench-login requires the 'httpx' package") from e
+    from app.main import app
+
+    password = secrets.token_urlsafe(16)
+    user = User(email=BENCH_EMAIL, hashed_password=hash_password(password), role=Role.ADMIN)
+    db.add(user)
+    db.commit()
+
+    limiter_enabled, limiter.enabled = limiter.enabled, False
+    results = {}
+    try:
+        # the lifespan starts the password pool
+        with TestClient(app) as client:
+            token = client.post("/auth/login", data={"username": BENCH_EMAIL, "password": password}).json()
+            headers = {"Authorization": f"Bearer {token['access_token']}"}
+            probe = lambda: client.get(PROBE_PATH, headers=headers).raise_for_status()
+
+            results["idle"] = {"probe": timed(probe, probes)}
+            if password_pool.stats()["workers"]:
+                results["process pool"] = _login_flood(client, password, logins, concurrency, probe)
+            password_pool.stop()
+            results["inline"] = _login_flood(client, password, logins, concurrency, probe)
+    finally:
+        limiter.enabled = limiter_enabled
+        db.execute(delete(LoginAttempt).where(LoginAttempt.user_id == user.id))
+        db.execute(delete(User).where(User.id == user.id))
+        db.commit()
+    return results
+
+
+def bench_tokens(repeat: int = 20000) -> dict:
+    """Time the full signature check of an access token against a token_cache hit.
+
+    Uses whichever JWT_BACKEND is configured; no database is involved.
+    """
+    token = create_access_token({"sub": "0"})
+    verified = _verify_token(token, "access")
+    token_cache.clear()
+    decode_access_token(token)  # the miss that fills the cache
+    return {
+        "same": decode_access_token(token) == verified,
+        "verify": timed(lambda: _verify_token(token, "access"), repeat),
+        "cached": timed(lambda: decode_access_token(token), repeat),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.auth.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    purge_cmd = sub.add_parser(
+        "purge",
+        help="delete expired/revoked refresh tokens, expired revocations and old login attempts",
+    )
+    purge_cmd.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE)
+    purge_cmd.add_argument("--dry-run", action="store_true", help="only count the rows that would be deleted")
+    sub.add_parser("check-statements", help="fail if login or refresh take more than one read and one commit")
+    bench = sub.add_parser("bench-login", help="login throughput and other-route latency during a login flood")
+    bench.add_argument("--logins", type=int, default=200)
+    bench.add_argument("--concurrency", type=int, default=16)
+    tokens_cmd = sub.add_parser("bench-tokens", help="access-token signature check against a token cache hit")
+    tokens_cmd.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "check-statements":
+            results = check_auth_statements(db)
+            ok = True
+            for name, counts in results.items():
+                expected = EXPECTED_STATEMENTS[name]
+                passed = (counts["reads"], counts["commits"]) == expected
+                ok = ok and passed
+                print(
+                    f"{'ok' if passed else 'FAIL':<8} {name}: {counts['reads']} reads, "
+                    f"{counts['writes']} writes, {counts['commits']} commits"
+                )
+            return 0 if ok else 1
+
+        if args.command == "bench-login":
+            results = bench_login(db, logins=args.logins, concurrency=args.concurrency)
+            print(f"other route: GET {PROBE_PATH}")
+            print(
+                f"password pool: {settings.PASSWORD_POOL_WORKERS} workers, {settings.PASSWORD_POOL_MAX_QUEUED} queued;"
+                f" database pool: {settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW} connections"
+            )
+            print(format_timing("idle: other route", results["idle"]["probe"]))
+            for name, result in results.items():
+                if name == "idle":
+                    continue
+                print(f"{name}: {result['rejected']} logins rejected with 503")
+                print(format_timing("  logins", result["logins"]))
+                print(format_timing("  other route", result["probe"]))
+            return 0
+
+        if args.command == "bench-tokens":
+            if settings.TOKEN_CACHE_MAX_SIZE <= 0:
+                print("TOKEN_CACHE_MAX_SIZE is 0, the token cache is disabled")
+                return 1
+            result = bench_tokens(args.repeat)
+            speedup = result["verify"]["p50_ms"] / result["cached"]["p50_ms"]
+            print(f"{'ok' if result['same'] else 'MISMATCH':<8} JWT_BACKEND={settings.JWT_BACKEND.value}: cache hit {speedup:.1f}x faster")
+            print(format_timing("  signature check", result["verify"]))
+            print(format_timing("  token cache hit", result["cached"]))
+            return 0 if result["same"] else 1
+
+        counts = purge(db, batch_size=args.batch_size, dry_run=args.dry_run)
+        for table, count in counts.items():
+            print(f"{table}: {count} rows {'expired' if args.dry_run else 'deleted'}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -12,10 +12,10 @@ class RefreshToken(Base):
     token_hash = Column(String, nullable=False)
 
     revoked = Column(Boolean, default=False, nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    table_args = (
+    __table_args__ = (
         Index("ix_refresh_tokens_user_active", "user_id", "revoked"),
     )
 
@@ -29,4 +29,18 @@ class LoginAttempt(Base):
     success = Column(Boolean, nullable=False)
     ip = Column(String(45), nullable=True)
     user_agent = Column(String(512), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+class TokenRevocation(Base):
+    """One revoked access token (jti) or all of a user's tokens issued before not_before."""
+
+    __tablename__ = "token_revocations"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    jti = Column(String, nullable=True)
+    not_before = Column(DateTime(timezone=True), nullable=True)
+    # after this every token the row can match has expired, so it can be purged
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.auth.models import TokenRevocation
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_revocations"
+
+# Serializes token_revocations inserts so ids are handed out in commit order
+# and the "id > last seen" poll below never skips a row.
+TOKEN_REVOCATIONS_LOCK = 0x7265766B  # "revk"
+
+
+class RevocationIndex:
+    """In-memory copy of the unexpired token_revocations rows.
+
+    Access tokens are checked against it on every request without touching
+    the database: a revoked jti, or a token issued before its user's
+    not_before, is rejected. A background thread pulls rows committed by
+    other workers every poll_interval seconds and drops entries whose tokens
+    have expired anyway, so the index holds at most one access-token
+    lifetime of revocations. Revocations committed in this process apply
+    immediately.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._jtis: dict[str, float] = {}
+        self._not_before: dict[int, tuple[float, float]] = {}
+        self._last_id = 0
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.failed_polls = 0
+        self.rejected = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # load synchronously, so the first request already sees every revocation
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="token-revocations", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                with self._lock:
+                    self.failed_polls += 1
+                logger.exception("failed to refresh token revocations")
+
+    def refresh(self):
+        """Apply rows committed since the last poll and prune expired entries."""
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    TokenRevocation.id,
+                    TokenRevocation.user_id,
+                    TokenRevocation.jti,
+                    TokenRevocation.not_before,
+                    TokenRevocation.expires_at,
+                )
+                .where(
+                    TokenRevocation.id > self._last_id,
+                    TokenRevocation.expires_at > datetime.now(timezone.utc),
+                )
+                .order_by(TokenRevocation.id)
+            ).all()
+        finally:
+            db.close()
+
+        for row in rows:
+            self.add(row.user_id, row.jti, row.not_before, row.expires_at)
+        with self._lock:
+            if rows:
+                self._last_id = max(self._last_id, rows[-1].id)
+            self.polls += 1
+        self._prune()
+
+    def add(self, user_id: int, jti: str | None, not_before: datetime | None, expires_at: datetime):
+        expires = expires_at.timestamp()
+        with self._lock:
+            if jti is not None:
+                self._jtis[jti] = expires
+            if not_before is not None:
+                cutoff = not_before.timestamp()
+                current = self._not_before.get(user_id)
+                if current is None or current[0] < cutoff:
+                    self._not_before[user_id] = (cutoff, expires)
+
+    def _prune(self):
+        now = time.time()
+        with self._lock:
+            self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+            self._not_before = {
+                user_id: entry for user_id, entry in self._not_before.items() if entry[1] > now
+            }
+
+    def is_revoked(self, claims: dict) -> bool:
+        # never touches the database; until start() has run (lifespan) only
+        # revocations committed by this process are known
+        revoked = claims.get("jti") in self._jtis
+        if not revoked:
+            entry = self._not_before.get(int(claims["sub"]))
+            revoked = entry is not None and claims.get("iat", 0) < entry[0]
+        if revoked:
+            with self._lock:
+                self.rejected += 1
+        return revoked
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "revoked_tokens": len(self._jtis),
+                "revoked_users": len(self._not_before),
+                "last_id": self._last_id,
+                "polls": self.polls,
+                "failed_polls": self.failed_polls,
+                "rejected": self.rejected,
+            }
+
+
+revocation_index = RevocationIndex(poll_interval=settings.REVOCATION_POLL_SECONDS)
+
+
+def _stage(db: Session, row: dict):
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": TOKEN_REVOCATIONS_LOCK})
+    db.execute(insert(TokenRevocation), [row])
+    db.info.setdefault(_PENDING_KEY, []).append(row)
+
+
+def revoke_access_token(db: Session, claims: dict):
+    """Revoke one access token until it expires; takes effect when the caller commits."""
+    _stage(
+        db,
+        {
+            "user_id": int(claims["sub"]),
+            "jti": claims["jti"],
+            "not_before": None,
+            "expires_at": datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        },
+    )
+
+
+def revoke_user_tokens(db: Session, user_id: int):
+    """Revoke every access token issued to user_id so far; takes effect when the caller commits."""
+    now = datetime.now(timezone.utc)
+    _stage(
+        db,
+        {
+            "user_id": user_id,
+            "jti": None,
+            # compared with the sub-second iat, so a token issued right after
+            # this (say, the user logging straight back in) stays valid;
+            # older tokens with a whole-second iat round down and are revoked
+            "not_before": now,
+            "expires_at": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        },
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session):
+    for row in session.info.pop(_PENDING_KEY, ()):
+        revocation_index.add(row["user_id"], row["jti"], row["not_before"], row["expires_at"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -5,13 +5,14 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.rate_limiter import limiter
 
-from app.auth.schemas import Token, TokenRefreshRequest
-from app.auth.service import authenticate_user, create_user
+from app.auth.schemas import Token, TokenRefreshRequest, LogoutRequest
+from app.auth.service import access_token_claims, check_password, create_user
+from app.auth.revocation import revoke_access_token, revoke_user_tokens
 from app.users.schemas import UserCreate, UserOut
 
 from app.core.security import (
-    create_access_token,
-    create_refresh_token,
+    issue_access_token,
+    issue_refresh_token,
     decode_access_token,
     hash_refresh_token,
     exp_to_datetime,
@@ -25,7 +26,7 @@ from app.services.auth_security import is_locked, register_failed_login, registe
 
 from app.auth.models import LoginAttempt 
 
-from app.audit.models import AuditLog
+from app.audit.service import log_action
 from datetime import datetime, timezone
 
 
@@ -58,19 +59,20 @@ def revoke_all_refresh_tokens(db: Session, user_id: int, request: Request, reaso
         RefreshToken.user_id == user_id,
         RefreshToken.revoked.is_(False),
     ).update({"revoked": True}, synchronize_session=False)
+    # access tokens already handed out may belong to whoever replayed the token
+    revoke_user_tokens(db, user_id)
 
-    db.add(
-        AuditLog(
-            user_id=user_id,
-            action="TOKEN_REUSE_DETECTED",
-            entity="auth",
-            entity_id=user_id,
-            new_data={
-                "ip": client_ip(request),
-                "user_agent": request.headers.get("user-agent"),
-                "reason": reason,
-            },
-        )
+    log_action(
+        db=db,
+        user_id=user_id,
+        action="TOKEN_REUSE_DETECTED",
+        entity="auth",
+        entity_id=user_id,
+        new_data={
+            "ip": client_ip(request),
+            "user_agent": request.headers.get("user-agent"),
+            "reason": reason,
+        },
     )
 
 @router.post("/register", response_model=UserOut)
@@ -89,6 +91,27 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     )
 
 
+def issue_tokens(db: Session, user_id: int) -> dict:
+    """Mint an access/refresh pair and stage the refresh token row; the caller commits."""
+    access_token, _ = issue_access_token({"sub": str(user_id)})
+    refresh_token, refresh_claims = issue_refresh_token({"sub": str(user_id)})
+
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            jti=refresh_claims["jti"],
+            token_hash=hash_refresh_token(refresh_token),
+            expires_at=exp_to_datetime(refresh_claims["exp"]),
+            revoked=False,
+        )
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+# Login is one SELECT of the user and one commit (login attempt, refresh token
+# and any lockout/rehash update); refresh is one SELECT ... FOR UPDATE of the
+# token joined to its user and one commit.
+
 @router.post("/login", response_model=Token)
 @limiter.limit("5/minute")
 def login(request: Request, data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
@@ -101,9 +124,7 @@ def login(request: Request, data: OAuth2PasswordRequestForm = Depends(), db: Ses
         db.commit()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_CREDENTIALS_MSG)
 
-    authed = authenticate_user(db, identifier, data.password)
-
-    if not authed:
+    if not user or not check_password(user, data.password):
         if user:
             register_failed_login(user)
         log_login_attempt(db, identifier, user.id if user else None, False, request)
@@ -112,26 +133,10 @@ def login(request: Request, data: OAuth2PasswordRequestForm = Depends(), db: Ses
 
     register_success_login(user)
     log_login_attempt(db, identifier, user.id, True, request)
-
-    access_token = create_access_token({"sub": str(user.id)})
-    refresh_token = create_refresh_token({"sub": str(user.id)})
-
-    refresh_payload = decode_access_token(refresh_token, token_type="refresh")
-    refresh_jti = refresh_payload["jti"]
-    expires_at = exp_to_datetime(refresh_payload["exp"])
-
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            jti=refresh_jti,
-            token_hash=hash_refresh_token(refresh_token),
-            expires_at=expires_at,
-            revoked=False,
-        )
-    )
+    tokens = issue_tokens(db, user.id)
     db.commit()
 
-    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+    return tokens
 
 
 @router.post("/refresh", response_model=Token)
@@ -145,10 +150,19 @@ def refresh(request: Request, data: TokenRefreshRequest, db: Session = Depends(g
     user_id = int(payload["sub"])
     jti = payload["jti"]
 
-    rt = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
+    # the join stands in for loading the user; the row lock makes a token
+    # usable once even when it is presented twice concurrently
+    rt = (
+        db.query(RefreshToken)
+        .join(User, User.id == RefreshToken.user_id)
+        .filter(RefreshToken.jti == jti)
+        .with_for_update(of=RefreshToken)
+        .first()
+    )
 
     if not rt:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_CREDENTIALS_MSG)
+
     if rt.expires_at and rt.expires_at < datetime.now(timezone.utc):
         rt.revoked = True
         db.commit()
@@ -164,28 +178,47 @@ def refresh(request: Request, data: TokenRefreshRequest, db: Session = Depends(g
         db.commit()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_CREDENTIALS_MSG)
 
-    user = db.get(User, user_id)
-    if not user:
+    if rt.user_id != user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_CREDENTIALS_MSG)
 
     rt.revoked = True
+    tokens = issue_tokens(db, user_id)
+    db.commit()
 
-    new_access_token = create_access_token({"sub": str(user.id)})
-    new_refresh_token = create_refresh_token({"sub": str(user.id)})
-
-    new_payload = decode_access_token(new_refresh_token, token_type="refresh")
-    new_expires_at = exp_to_datetime(new_payload["exp"])
-    new_jti = new_payload["jti"]
+    return tokens
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    data: LogoutRequest | None = None,
+    claims: dict = Depends(access_token_claims),
+    db: Session = Depends(get_db),
+):
+    """Revoke the presented access token and, if given, its refresh token."""
+    user_id = int(claims["sub"])
+    revoke_access_token(db, claims)
+
+    if data and data.refresh_token:
+        try:
+            payload = decode_access_token(data.refresh_token, token_type="refresh")
+        except HTTPException:
+            payload = None
+        if payload and int(payload["sub"]) == user_id:
+            db.query(RefreshToken).filter(
+                RefreshToken.jti == payload["jti"],
+                RefreshToken.user_id == user_id,
+            ).update({"revoked": True}, synchronize_session=False)
 
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            jti=new_jti,
-            token_hash=hash_refresh_token(new_refresh_token),
-            expires_at=new_expires_at,
-            revoked=False,
-        )
-    )
     db.commit()
 
-    return {"access_token": new_access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
\ No newline at end of file
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(claims: dict = Depends(access_token_claims), db: Session = Depends(get_db)):
+    """End every session of the current user, on every worker within REVOCATION_POLL_SECONDS."""
+    user_id = int(claims["sub"])
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked.is_(False),
+    ).update({"revoked": True}, synchronize_session=False)
+    revoke_user_tokens(db, user_id)
+    db.commit()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel,EmailStr
 
 class LoginRequest(BaseModel):
@@ -10,4 +12,7 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 class TokenRefreshRequest(BaseModel):
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
@@ -3,10 +3,13 @@ from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
 from app.common.enums import Role
 from app.users.models import User
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.auth.user_cache import CachedUser, get_cached_user, get_cached_user_async
+from app.auth.revocation import revocation_index
 from app.core.security import (
     hash_password,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     decode_access_token,
 )
@@ -14,14 +17,18 @@ from app.core.security import (
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def check_password(user: User, password: str) -> bool:
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if verified and new_hash:
+        # stored with older argon2 parameters; saved with the caller's commit
+        user.hashed_password = new_hash
+    return verified
+
+
 def authenticate_user(db: Session, email: str, password: str) -> User | None:
     user = db.query(User).filter(User.email == email).first()
-    if not user:
-        return None
-
-    if not verify_password(password, user.hashed_password):
+    if not user or not check_password(user, password):
         return None
-
     return user
 
 
@@ -46,24 +53,54 @@ def create_user(
     return user
 
 
+def access_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified, unrevoked claims of the bearer token; no database access."""
+    payload = decode_access_token(token, token_type="access")
+
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+
+    # checked on every request, after the token cache, so a cached token
+    # stops working as soon as the revocation reaches this worker
+    if revocation_index.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    return payload
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
-    payload = decode_access_token(token, token_type="access")
+) -> CachedUser:
+    user_id = int(access_token_claims(token)["sub"])
 
-    user_id: str | None = payload.get("sub")
-    if user_id is None:
+    user = get_cached_user(db, user_id)
+    if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
+            detail="Inactive user",
         )
 
-    user = db.get(User, int(user_id))
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> CachedUser:
+    user_id = int(access_token_claims(token)["sub"])
+
+    user = await get_cached_user_async(db, user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
         )
 
-    return user
\ No newline at end of file
+    return user
@@ -0,0 +1,98 @@
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.common.enums import Role
+from app.core.cache import make_cache
+from app.core.config import settings
+from app.users.models import User
+
+_PENDING_KEY = "user_cache_invalidate"
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Detached snapshot of the fields request handlers read from the current user."""
+
+    id: int
+    email: str | None
+    role: Role
+    is_active: bool
+    is_verified: bool
+
+
+user_cache = make_cache(
+    "users",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def _snapshot(user: User) -> CachedUser:
+    return CachedUser(
+        id=user.id,
+        email=user.email,
+        role=Role(user.role),
+        is_active=bool(user.is_active),
+        is_verified=bool(user.is_verified),
+    )
+
+
+def _lookup(user_id: int) -> CachedUser | None:
+    data = user_cache.get(str(user_id))
+    if data is None:
+        return None
+    return CachedUser(**{**data, "role": Role(data["role"])})
+
+
+def _store(user: User) -> CachedUser:
+    cached = _snapshot(user)
+    user_cache.set(str(user.id), {**asdict(cached), "role": cached.role.value})
+    return cached
+
+
+def get_cached_user(db: Session, user_id: int) -> CachedUser | None:
+    cached = _lookup(user_id)
+    if cached is not None:
+        return cached
+
+    user = db.get(User, user_id)
+    return _store(user) if user is not None else None
+
+
+async def get_cached_user_async(db: AsyncSession, user_id: int) -> CachedUser | None:
+    cached = _lookup(user_id)
+    if cached is not None:
+        return cached
+
+    user = await db.get(User, user_id)
+    return _store(user) if user is not None else None
+
+
+def invalidate_user(user_id: int):
+    user_cache.delete(str(user_id))
+
+
+# Any change to a user row (lockout, deactivation, role change, ...) drops the
+# cached snapshot once the transaction commits, so a concurrent miss cannot
+# repopulate the cache with pre-commit data.
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,5 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text,Boolean
+from sqlalchemy import Column, Integer, String, Text,Boolean, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.core.database import Base
+from app.core.search import search_vector_sql
 
 class Category(Base):
     __tablename__ = "categories"
@@ -7,4 +10,17 @@ class Category(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
-    is_deleted = Column(Boolean, default=False)
\ No newline at end of file
+    is_deleted = Column(Boolean, default=False)
+    # bumped on every ORM update; UPDATEs check it, and it is the row's ETag
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # generated full-text document for search; never loaded with the row
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql(("name", "A"), ("description", "B")), persisted=True),
+    ))
+
+    __table_args__ = (
+        Index("ix_categories_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"version_id_col": version}
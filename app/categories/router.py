@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException,Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from app.categories.schemas import CategoryCreate, CategoryOut,CategoryList
+from app.categories.schemas import CategoryCreate, CategoryOut,CategoryList, category_list_adapter
 from app.categories.service import create_category, get_categories, get_category, update_category, delete_category
 from app.core.database import get_db
-from app.core.dependencies import require_role,pagination_params,sorting_params
-from app.common.enums import Role
+from app.core.etag import not_modified_or_tag, row_etag, weak_etag
+from app.core.generations import table_generation
+from app.core.responses import adapter_response
+from app.core.dependencies import require_role,pagination_params,sorting_params,total_mode_param
+from app.common.enums import Role, TotalMode
 
 router = APIRouter(
     prefix="/categories",
@@ -23,38 +26,65 @@ def create_cat(category: CategoryCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=CategoryList)
 def list_categories(
+    response: Response,
     db: Session = Depends(get_db),
     pagination: dict = Depends(pagination_params),
     sorting: dict = Depends(sorting_params),
+    total_mode: TotalMode = Depends(total_mode_param),
     search: str | None = Query(None),
+    if_none_match: str | None = Header(None),
 ):
-    return get_categories(
+    # read before the page, so a write landing in between can only cost an extra fetch
+    etag = weak_etag("categories", table_generation(db, "categories"))
+    not_modified = not_modified_or_tag(if_none_match, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = get_categories(
         db=db,
         page=pagination["page"],
         page_size=pagination["page_size"],
         offset=pagination["offset"],
         sort_by=sorting["sort_by"],
         sort_order=sorting["sort_order"],
+        total_mode=total_mode,
         search=search,
     )
+    return adapter_response(category_list_adapter, page, headers=response.headers)
 
 @router.get("/{category_id}", response_model=CategoryOut)
-def retrieve_category(category_id: int, db: Session = Depends(get_db)):
+def retrieve_category(
+    category_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: str | None = Header(None),
+):
     cat = get_category(db, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
-    return cat
+    return not_modified_or_tag(if_none_match, response, row_etag("category", cat)) or cat
 
 @router.put("/{category_id}", response_model=CategoryOut)
-def update_cat(category_id: int, category: CategoryCreate, db: Session = Depends(get_db)):
-    updated = update_category(db, category_id, category)
+def update_cat(
+    category_id: int,
+    category: CategoryCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_match: str | None = Header(None),
+):
+    updated = update_category(db, category_id, category, if_match=if_match)
     if not updated:
         raise HTTPException(status_code=404, detail="Category not found")
+    response.headers["ETag"] = row_etag("category", updated)
     return updated
 
 @router.delete("/{category_id}", response_model=CategoryOut)
-def delete_cat(category_id: int, db: Session = Depends(get_db)):
-    deleted = delete_category(db, category_id)
+def delete_cat(
+    category_id: int,
+    db: Session = Depends(get_db),
+    if_match: str | None = Header(None),
+):
+    deleted = delete_category(db, category_id, if_match=if_match)
     if not deleted:
         raise HTTPException(status_code=404, detail="Category not found")
     return deleted
\ No newline at end of file
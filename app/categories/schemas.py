@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional,List
 
 class CategoryCreate(BaseModel):
@@ -14,7 +14,11 @@ class CategoryOut(BaseModel):
         from_attributes = True
 
 class CategoryList(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    items: List[CategoryOut]
\ No newline at end of file
+    has_next: bool
+    items: List[CategoryOut]
+
+
+category_list_adapter = TypeAdapter(CategoryList)
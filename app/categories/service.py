@@ -3,8 +3,10 @@ from fastapi import HTTPException
 from app.categories.models import Category
 from app.categories.schemas import CategoryCreate
 from app.products.models import Product
-from sqlalchemy import or_
-from app.core.query_utils import apply_pagination,apply_sorting
+from app.common.enums import TotalMode
+from app.core.query_utils import apply_sorting, paginate_offset
+from app.core.search import apply_text_search
+from app.core.etag import check_if_match, flush_versioned, row_etag
 
 def create_category(db: Session, data: CategoryCreate):
     existing = db.query(Category).filter(
@@ -33,29 +35,25 @@ def get_categories(
     sort_by: str | None,
     sort_order: str,
     search: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
 ):
     query = db.query(Category).filter(Category.is_deleted == False)
 
+    rank = None
     if search:
-        query = query.filter(
-            or_(
-                Category.name.ilike(f"%{search}%"),
-                Category.description.ilike(f"%{search}%"),
-            )
-        )
-
-    total = query.count()
+        query, rank = apply_text_search(query, Category.search_vector, search)
 
+    if rank is not None and not sort_by:
+        query = query.order_by(rank.desc(), Category.id)
     query = apply_sorting(query, Category, sort_by, sort_order)
 
-    query = apply_pagination(query, offset, page_size)
-
-    items = query.all()
+    items, total, has_next = paginate_offset(query, offset, page_size, total_mode)
 
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
+        "has_next": has_next,
         "items": items,
     }
 
@@ -65,11 +63,12 @@ def get_category(db: Session, category_id: int):
         Category.is_deleted==False
         ).first()
 
-def update_category(db: Session, category_id: int, data: CategoryCreate):
+def update_category(db: Session, category_id: int, data: CategoryCreate, if_match: str | None = None):
     category = get_category(db, category_id)
 
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    check_if_match(if_match, row_etag("category", category))
 
     if data.name != category.name:
         existing = db.query(Category).filter(
@@ -82,16 +81,18 @@ def update_category(db: Session, category_id: int, data: CategoryCreate):
 
     category.name = data.name
     category.description = data.description
+    flush_versioned(db, if_match)
 
     db.commit()
     db.refresh(category)
     return category
 
-def delete_category(db: Session, category_id: int):
+def delete_category(db: Session, category_id: int, if_match: str | None = None):
     category = get_category(db, category_id)
 
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    check_if_match(if_match, row_etag("category", category))
 
     product_exists = db.query(Product).filter(
         Product.category_id == category_id,
@@ -105,6 +106,7 @@ def delete_category(db: Session, category_id: int):
         )
 
     category.is_deleted = True
+    flush_versioned(db, if_match)
     db.commit()
     db.refresh(category)
 
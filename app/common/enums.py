@@ -6,4 +6,28 @@ class Role(str, Enum):
     USER = "user"
 class ChangeType(str,Enum):
     IN="IN"
-    OUT="OUT"
\ No newline at end of file
+    OUT="OUT"
+class BatchMode(str, Enum):
+    ATOMIC = "atomic"
+    BEST_EFFORT = "best_effort"
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class LowStockEventType(str, Enum):
+    ENTERED = "ENTERED"
+    LEFT = "LEFT"
+
+class AuditMode(str, Enum):
+    TRANSACTIONAL = "transactional"
+    BUFFERED = "buffered"
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+class JwtBackend(str, Enum):
+    JOSE = "jose"
+    PYJWT = "pyjwt"
@@ -0,0 +1,66 @@
+"""Timing and statement-counting helpers for the bench-* commands."""
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def summarize(durations: list[float], elapsed: float) -> dict:
+    """Throughput and latency of len(durations) calls that took elapsed seconds overall."""
+    if not durations:
+        return {"count": 0, "per_second": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+    return {
+        "count": len(durations),
+        "per_second": len(durations) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+    }
+
+
+def timed(fn, repeat: int) -> dict:
+    """Call fn repeat times in a row and summarize the calls."""
+    durations = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    return summarize(durations, time.perf_counter() - started)
+
+
+def format_timing(name: str, stats: dict) -> str:
+    return (
+        f"{name:<40} {stats['per_second']:>10.1f}/s"
+        f"  p50 {stats['p50_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms"
+    )
+
+
+@contextmanager
+def count_statements(engine: Engine):
+    """Count the reads, writes and commits run on engine, from any thread."""
+    counts = {"reads": 0, "writes": 0, "commits": 0}
+    lock = threading.Lock()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        kind = "reads" if statement.lstrip().upper().startswith("SELECT") else "writes"
+        with lock:
+            counts[kind] += 1
+
+    def on_commit(conn):
+        with lock:
+            counts["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine, "commit", on_commit)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(engine, "commit", on_commit)
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class MemoryCache:
+    """Size-bounded LRU with per-entry expiry, local to one worker process."""
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, record_stats: bool = True):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += record_stats
+                return None
+            self._data.move_to_end(key)
+            self.hits += record_stats
+            return entry[1]
+
+    def set(self, key: str, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCache:
+    """Same interface backed by Redis, so every worker shares one cache.
+
+    Values must be JSON-serializable. Size bounds and eviction are left to
+    the Redis server's maxmemory policy.
+    """
+
+    def __init__(self, name: str, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+
+        self.name = name
+        self.ttl = ttl
+        self.prefix = f"{settings.APP_NAME}:{name}:"
+        self._client = redis.Redis.from_url(url)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, record_stats: bool = True):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            self.misses += record_stats
+            return None
+        self.hits += record_stats
+        return json.loads(raw)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        ttl_ms = max(1, int((self.ttl if ttl is None else ttl) * 1000))
+        self._client.set(self.prefix + key, json.dumps(value, default=str), px=ttl_ms)
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_caches: dict[str, MemoryCache | RedisCache] = {}
+
+
+def make_cache(name: str, max_size: int, ttl: float, local: bool = False) -> MemoryCache | RedisCache:
+    """local=True keeps the cache in-process whatever CACHE_BACKEND says."""
+    if settings.CACHE_BACKEND == "redis" and not local:
+        if not settings.REDIS_URL:
+            raise RuntimeError("CACHE_BACKEND=redis requires REDIS_URL")
+        cache = RedisCache(name, settings.REDIS_URL, ttl)
+    else:
+        cache = MemoryCache(name, max_size, ttl)
+
+    _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> dict:
+    stats = {}
+    for name, cache in _caches.items():
+        s = cache.stats()
+        lookups = s["hits"] + s["misses"]
+        s["hit_ratio"] = round(s["hits"] / lookups, 4) if lookups else None
+        stats[name] = s
+    return stats
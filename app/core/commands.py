@@ -0,0 +1,116 @@
+"""Benchmarks for the shared middleware.
+
+Usage:
+    python -m app.core.commands bench-middleware [--requests N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI, Request
+from slowapi.middleware import SlowAPIMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.benchmark import format_timing, summarize
+from app.core.rate_limiter import RateLimitMiddleware, limiter
+from app.core.security_headers import AUTH_HEADERS, SECURITY_HEADERS, SecurityHeadersMiddleware
+
+
+class BaseHTTPSecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """SecurityHeadersMiddleware as it was before, for comparison only."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers.update(SECURITY_HEADERS)
+        if request.url.path.startswith("/auth/"):
+            response.headers.update(AUTH_HEADERS)
+        return response
+
+
+def _bench_app(*middleware) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+
+    @app.get("/bench")
+    def bench():
+        return {"ok": True}
+
+    # added innermost first, as app/main.py does
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+
+STACKS = {
+    "no middleware": (),
+    "BaseHTTPMiddleware (before)": (SlowAPIMiddleware, BaseHTTPSecurityHeadersMiddleware),
+    "plain ASGI (now)": (RateLimitMiddleware, SecurityHeadersMiddleware),
+}
+
+_SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/bench",
+    "raw_path": b"/bench",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+async def _request(app) -> list[tuple[bytes, bytes]]:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(dict(_SCOPE), receive, send)
+    return sorted(sent[0]["headers"])
+
+
+async def _bench_stack(app, requests: int) -> tuple[dict, list]:
+    headers = await _request(app)  # warm up (route lookup, dependency cache)
+    durations = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        await _request(app)
+        durations.append(time.perf_counter() - t0)
+    return summarize(durations, time.perf_counter() - started), headers
+
+
+def bench_middleware(requests: int = 20000) -> dict[str, tuple[dict, list]]:
+    """Requests per second on a trivial route, called in-process without a server."""
+    return {
+        name: asyncio.run(_bench_stack(_bench_app(*middleware), requests))
+        for name, middleware in STACKS.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench-middleware", help="requests per second of the middleware stacks on a trivial route")
+    bench.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    results = bench_middleware(args.requests)
+    for name, (stats, _) in results.items():
+        print(format_timing(name, stats))
+    before = results["BaseHTTPMiddleware (before)"][1]
+    now = results["plain ASGI (now)"][1]
+    print(f"{'ok' if before == now else 'MISMATCH':<8} response headers of both stacks")
+    return 0 if before == now else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,26 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
+from app.common.enums import AuditMode, JwtBackend
+
 
 class Settings(BaseSettings):
     APP_NAME: str = "Inventory API"
     DEBUG: bool = False
     DATABASE_URL: str
+    # serve the /async/* routers through an asyncpg engine next to the sync one
+    ASYNC_DB_ENABLED: bool = False
+
+    # connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side timeout
+    # PgBouncer (transaction pooling): let PgBouncer pool and avoid prepared statements
+    DB_USE_NULLPOOL: bool = False
+    DB_DISABLE_PREPARED_STATEMENTS: bool = False
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     POSTGRES_PASSWORD:str
@@ -14,12 +29,69 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_SECRET_KEY: str
     REFRESH_TOKEN_SECRET_KEY: str
 
+    # argon2 cost; hashes made with other parameters are upgraded on the next login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
+    # password hashing runs in this many worker processes (0 = inline); at most
+    # PASSWORD_POOL_MAX_QUEUED more wait before login/register answer 503
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_QUEUED: int = 16
+    PASSWORD_POOL_TIMEOUT_SECONDS: float = 10.0
+
     JWT_ISSUER: str = "inventory-api"
     JWT_AUDIENCE: str = "inventory-api-clients"
     
     ALGORITHM :str= "HS256"
+    # "pyjwt" needs the PyJWT package; tokens are interchangeable between backends
+    JWT_BACKEND: JwtBackend = JwtBackend.JOSE
+    # verified access-token claims kept per worker until each token's exp; 0 disables
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    # how often each worker picks up access-token revocations made by the others
+    REVOCATION_POLL_SECONDS: float = 2.0
+    # purge job (python -m app.auth.commands purge): revoked refresh tokens are
+    # kept this long for reuse detection, login attempts for auditing
+    REVOKED_REFRESH_TOKEN_RETENTION_DAYS: int = 1
+    LOGIN_ATTEMPT_RETENTION_DAYS: int = 90
+    PURGE_BATCH_SIZE: int = 5000
 
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
+
+    # "memory" caches are per worker process; "redis" shares them across workers
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str | None = None
+
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    REPORT_CACHE_TTL_SECONDS: int = 300
+    REPORT_CACHE_MAX_SIZE: int = 256
+
+    # list totals with total=estimated: planner estimates at or below this are
+    # replaced by an exact count; both are cached per filter for the TTL
+    COUNT_ESTIMATE_EXACT_BELOW: int = 10000
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_CACHE_MAX_SIZE: int = 1024
+
+    # "transactional" writes audit rows in the caller's transaction; "buffered"
+    # queues them after commit and flushes them in batches from a background thread
+    AUDIT_MODE: AuditMode = AuditMode.TRANSACTIONAL
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_FLUSH_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 5.0
+    # a batch hit by a connection error is retried this many times, waiting
+    # AUDIT_FLUSH_RETRY_BACKOFF_SECONDS and doubling before each attempt
+    AUDIT_FLUSH_RETRIES: int = 4
+    AUDIT_FLUSH_RETRY_BACKOFF_SECONDS: float = 0.5
+
+    # monthly partitions (audit_logs, inventory): how many future months to keep ready,
+    # how many past months the retention command keeps
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_ON_STARTUP: bool = True
+    AUDIT_RETENTION_MONTHS: int = 24
+
     model_config = ConfigDict(env_file=".env")
 
 
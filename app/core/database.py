@@ -1,11 +1,46 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, register_engine
+
+
+def _engine_options(is_async: bool = False) -> dict:
+    options = {"echo": settings.DEBUG, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if settings.DB_USE_NULLPOOL:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    connect_args = {}
+    if is_async:
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        if settings.DB_DISABLE_PREPARED_STATEMENTS:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        # psycopg2 never uses server-side prepared statements, only the timeout applies
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
 
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    **_engine_options(),
 )
+register_engine("sync", engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -22,3 +57,27 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+        **_engine_options(is_async=True),
+    )
+    register_engine("async", async_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters for one engine's pool in this worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / attempts, 6) if attempts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+_pools: dict[str, tuple[object, PoolMetrics]] = {}
+
+
+def _instrumented(base):
+    class InstrumentedPool(base):
+        metrics: PoolMetrics
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except PoolTimeoutError:
+                self.metrics.record(time.perf_counter() - start, timed_out=True)
+                raise
+            self.metrics.record(time.perf_counter() - start)
+            return conn
+
+        def recreate(self):
+            pool = super().recreate()
+            pool.metrics = self.metrics
+            return pool
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+InstrumentedQueuePool = _instrumented(QueuePool)
+InstrumentedAsyncQueuePool = _instrumented(AsyncAdaptedQueuePool)
+
+
+def register_engine(name: str, engine):
+    metrics = None
+    if isinstance(engine.pool, (InstrumentedQueuePool, InstrumentedAsyncQueuePool)):
+        metrics = engine.pool.metrics = PoolMetrics()
+    _pools[name] = (engine, metrics)
+
+
+def pool_stats() -> dict:
+    stats = {}
+    for name, (engine, metrics) in _pools.items():
+        pool = engine.pool
+        entry = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        if metrics is not None:
+            entry.update(metrics.snapshot())
+        stats[name] = entry
+    return {"pid": os.getpid(), "pools": stats}
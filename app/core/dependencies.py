@@ -3,10 +3,10 @@ from fastapi import Depends, HTTPException, status,Query
 from typing import Optional
 from app.users.models import User
 from app.auth.service import get_current_user
-from app.common.enums import Role
+from app.common.enums import Role, TotalMode
 
-def require_role(allowed_roles: list[Role]):
-    def checker(current_user: User = Depends(get_current_user)):
+def require_role(allowed_roles: list[Role], user_dependency=get_current_user):
+    def checker(current_user: User = Depends(user_dependency)):
         user_role = Role(current_user.role)
         if user_role not in allowed_roles:
             raise HTTPException(
@@ -35,4 +35,9 @@ def sorting_params(
     return {
         "sort_by": sort_by,
         "sort_order": sort_order,
-    }
\ No newline at end of file
+    }
+
+def total_mode_param(
+    total: TotalMode = Query(TotalMode.EXACT, description="exact, estimated (planner estimate) or none (has_next only)"),
+):
+    return total
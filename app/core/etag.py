@@ -0,0 +1,56 @@
+"""Weak ETags, conditional GETs (If-None-Match) and optimistic writes (If-Match)."""
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+# clients may keep a copy but must revalidate, which is a cheap 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def row_etag(entity: str, row) -> str:
+    """ETag of one versioned row (see version_id_col on the catalog models)."""
+    return weak_etag(entity, row.id, row.version)
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Weak comparison of etag against an If-None-Match / If-Match header."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified_or_tag(if_none_match: str | None, response: Response, etag: str) -> Response | None:
+    """Return a 304 if the client copy is current; otherwise tag the response being built."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def check_if_match(if_match: str | None, etag: str):
+    if if_match is not None and not etag_matches(if_match, etag):
+        raise HTTPException(status_code=412, detail="Resource has been modified")
+
+
+def flush_versioned(db: Session, if_match: str | None):
+    """Flush pending changes to versioned rows.
+
+    The UPDATE carries the version that was read, so a write that raced in
+    after the If-Match check (or after the read, without one) is rejected
+    rather than overwritten.
+    """
+    try:
+        db.flush()
+    except StaleDataError:
+        db.rollback()
+        if if_match is not None:
+            raise HTTPException(status_code=412, detail="Resource has been modified")
+        raise HTTPException(status_code=409, detail="Resource was modified concurrently, retry")
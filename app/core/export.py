@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from app.common.enums import ExportFormat
+from app.core.database import SessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _csv_cell(value):
+    value = _plain(value)
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def iter_export(
+    build_query: Callable[[Session], Query],
+    columns: list[str],
+    fmt: ExportFormat,
+) -> Iterator[str]:
+    """Yield encoded rows straight from a server-side cursor.
+
+    The generator owns its session because it outlives the request's
+    dependencies; rows are plain tuples, never ORM objects or schemas.
+    """
+    db = SessionLocal()
+    try:
+        rows = build_query(db).yield_per(EXPORT_BATCH_SIZE)
+
+        if fmt == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for i, row in enumerate(rows, start=1):
+                writer.writerow([_csv_cell(v) for v in row])
+                if i % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            chunk = []
+            for row in rows:
+                chunk.append(json.dumps({c: _plain(v) for c, v in zip(columns, row)}, default=str))
+                if len(chunk) == EXPORT_BATCH_SIZE:
+                    yield "\n".join(chunk) + "\n"
+                    chunk = []
+            if chunk:
+                yield "\n".join(chunk) + "\n"
+    finally:
+        db.close()
+
+
+def export_response(
+    build_query: Callable[[Session], Query],
+    columns: list[str],
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_export(build_query, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
@@ -0,0 +1,32 @@
+"""Per-table change counters for cheap list revalidation.
+
+A statement-level trigger on each watched table bumps its row in
+table_generations, so every committed write is counted whether it comes
+from the API, a command or manual SQL, and every worker sees the same value.
+"""
+from sqlalchemy import BigInteger, Column, String, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+
+# tables whose trigger is installed by the migration
+GENERATION_TABLES = ("products", "categories", "suppliers")
+
+
+class TableGeneration(Base):
+    __tablename__ = "table_generations"
+
+    table_name = Column(String(63), primary_key=True)
+    generation = Column(BigInteger, nullable=False, server_default="0")
+
+
+_READ_GENERATION = text("SELECT generation FROM table_generations WHERE table_name = :table")
+
+
+def table_generation(db: Session, table: str) -> int:
+    return db.execute(_READ_GENERATION, {"table": table}).scalar() or 0
+
+
+async def table_generation_async(db: AsyncSession, table: str) -> int:
+    return (await db.execute(_READ_GENERATION, {"table": table})).scalar() or 0
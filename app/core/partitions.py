@@ -0,0 +1,146 @@
+"""Monthly range partitions keyed on created_at.
+
+Partitioned tables get one child per calendar month (UTC), named
+<table>_pYYYYMM, plus a <table>_default child that catches rows outside the
+prepared range so an insert never fails for lack of a partition.
+"""
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# every maintenance run serializes on this, so concurrent workers at startup
+# or an overlapping cron job never race on the same DDL
+PARTITION_MAINTENANCE_LOCK = 0x70617274  # "part"
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def list_partitions(conn: Connection, table: str) -> dict[date, str]:
+    """Monthly children of table, keyed by their first day."""
+    names = conn.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            """
+        ),
+        {"table": table},
+    ).scalars()
+
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    months = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            months[date(int(match[1]), int(match[2]), 1)] = name
+    return months
+
+
+def create_month_partition(
+    conn: Connection,
+    table: str,
+    month: date,
+    key: str = "created_at",
+    prefix: str | None = None,
+) -> bool:
+    """Create the partition for month; returns False if it already exists.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new child before it is attached. prefix names the
+    children after another table, for a parent that is renamed later.
+    """
+    prefix = prefix or table
+    name = partition_name(prefix, month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return False
+
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    default = f"{prefix}_default"
+    in_range = f"{key} >= '{lower}' AND {key} < '{upper}'"
+
+    has_default = conn.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar() is not None
+    if has_default:
+        # CREATE ... PARTITION OF and ATTACH both fail if the default partition
+        # gains a row of the new range before they run. Locking the parent
+        # (not just the default) makes concurrent writes wait before they are
+        # routed, so they land in the new child once this commits; reads go on.
+        conn.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+    stray = has_default and conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")).scalar()
+
+    if not stray:
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        return True
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"""
+        WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *)
+        INSERT INTO {name} SELECT * FROM moved
+        """
+    ))
+    conn.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    return True
+
+
+def ensure_partitions(
+    conn: Connection,
+    table: str,
+    months_ahead: int,
+    start: date | None = None,
+    prefix: str | None = None,
+) -> list[str]:
+    """Make sure every month from start (default: this month) through months_ahead exists."""
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK})
+
+    first = month_start(start or datetime.now(timezone.utc))
+    last = add_months(month_start(datetime.now(timezone.utc)), months_ahead)
+
+    created = []
+    month = first
+    while month <= last:
+        if create_month_partition(conn, table, month, prefix=prefix):
+            created.append(partition_name(prefix or table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(conn: Connection, table: str, cutoff: date, dry_run: bool = False) -> list[str]:
+    """Detach and drop every monthly partition that ends on or before cutoff."""
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK})
+    # DETACH briefly locks the parent; give up rather than queue behind long queries
+    conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+
+    expired = [
+        name for month, name in sorted(list_partitions(conn, table).items())
+        if add_months(month, 1) <= cutoff
+    ]
+    if dry_run:
+        return expired
+
+    for name in expired:
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+    return expired
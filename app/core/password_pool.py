@@ -0,0 +1,120 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+class PasswordPool:
+    """Runs password hashing in worker processes, with a bounded backlog.
+
+    Argon2 is deliberately CPU- and memory-hungry; in the API process a login
+    storm would take every core from the other requests. Here at most
+    `workers` hashes run at once and at most `max_queued` more wait; past
+    that run() fails fast with 503 instead of queueing behind the storm.
+    Until start() is called (commands, PASSWORD_POOL_WORKERS=0) work runs
+    inline in the caller.
+    """
+
+    def __init__(self, workers: int, max_queued: int, timeout: float):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(workers + max_queued) if workers > 0 else None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._executor is not None or self.workers <= 0:
+                return
+            # spawn, not fork: the API process has threads and open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def stop(self):
+        with self._start_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, fn, *args):
+        executor = self._executor
+        if executor is None:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise _busy()
+
+        with self._stats_lock:
+            self.in_flight += 1
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # the slot is given back when the job finishes, not when the caller
+        # stops waiting, so jobs abandoned on timeout still count against
+        # max_queued and a storm cannot pile them up in the executor
+        future.add_done_callback(self._release)
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            # dropped if it never reached a worker; otherwise it runs to the end
+            future.cancel()
+            with self._stats_lock:
+                self.timed_out += 1
+            raise _busy()
+        except BaseException:
+            with self._stats_lock:
+                self.failed += 1
+            raise
+
+        with self._stats_lock:
+            self.completed += 1
+        return result
+
+    def _release(self, future=None):
+        self._slots.release()
+        with self._stats_lock:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "workers": self.workers if self._executor is not None else 0,
+                "max_queued": self.max_queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_queued=settings.PASSWORD_POOL_MAX_QUEUED,
+    timeout=settings.PASSWORD_POOL_TIMEOUT_SECONDS,
+)
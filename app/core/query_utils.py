@@ -1,5 +1,22 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query
-from sqlalchemy import asc, desc
+from sqlalchemy.sql.expression import ClauseElement, Executable, Select
+from sqlalchemy import asc, desc, func, select, tuple_
+
+from app.common.enums import TotalMode
+from app.core.cache import make_cache
+from app.core.config import settings
+
+# exact and estimated totals, keyed by the SQL and parameters of the filtered query
+count_cache = make_cache("counts", settings.COUNT_CACHE_MAX_SIZE, settings.COUNT_CACHE_TTL_SECONDS)
 
 
 def apply_sorting(query: Query, model, sort_by: str | None, sort_order: str):
@@ -13,4 +30,168 @@ def apply_sorting(query: Query, model, sort_by: str | None, sort_order: str):
 
 
 def apply_pagination(query: Query, offset: int, page_size: int):
-    return query.offset(offset).limit(page_size)
\ No newline at end of file
+    return query.offset(offset).limit(page_size)
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _count_signature(statement, dialect) -> str:
+    compiled = statement.compile(dialect=dialect)
+    raw = json.dumps([str(compiled), compiled.params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _plan_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(query: Query) -> int:
+    """Row estimate from the planner, without running the query."""
+    return _plan_rows(query.session.execute(_Explain(query.statement)).scalar())
+
+
+def count_total(query: Query, mode: TotalMode) -> int | None:
+    """Total for a filtered (unordered, unpaged) query, as cheap as mode allows.
+
+    estimated asks the planner first and only pays for an exact count when
+    the estimate is small enough for the count to be cheap; either result is
+    cached per filter signature for COUNT_CACHE_TTL_SECONDS.
+    """
+    if mode == TotalMode.NONE:
+        return None
+    if mode == TotalMode.EXACT:
+        return query.count()
+
+    key = _count_signature(query.statement, query.session.get_bind().dialect)
+    total = count_cache.get(key)
+    if total is None:
+        total = estimate_count(query)
+        if total <= settings.COUNT_ESTIMATE_EXACT_BELOW:
+            total = query.count()
+        count_cache.set(key, total)
+    return total
+
+
+def paginate_offset(query: Query, offset: int, page_size: int, total_mode: TotalMode = TotalMode.EXACT):
+    """Page an ordered query by offset.
+
+    Returns (items, total, has_next). total follows total_mode; has_next is
+    always exact, from fetching one row past the page.
+    """
+    total = count_total(query.order_by(None), total_mode)
+
+    rows = apply_pagination(query, offset, page_size + 1).all()
+    items = rows[:page_size]
+    return items, total, len(rows) > page_size
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_order(query, model, cursor: str | None, sort_order: str):
+    key = tuple_(model.created_at, model.id)
+
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        after = tuple_(created_at, id)
+        # the plain created_at bound is implied by the row comparison, but only
+        # it lets the planner prune partitions of a table partitioned on created_at
+        if sort_order == "asc":
+            query = query.filter(model.created_at >= created_at, key > after)
+        else:
+            query = query.filter(model.created_at <= created_at, key < after)
+
+    if sort_order == "asc":
+        return query.order_by(model.created_at.asc(), model.id.asc())
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def _keyset_page(rows: list, page_size: int):
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return items, next_cursor
+
+
+def paginate_keyset(query: Query, model, cursor: str | None, page_size: int, sort_order: str = "desc"):
+    """Page on (created_at, id) so each fetch is a single index range scan.
+
+    An empty cursor starts from the first page. Returns the items and the
+    opaque cursor for the next page (None on the last page).
+    """
+    rows = _keyset_order(query, model, cursor, sort_order).limit(page_size + 1).all()
+    return _keyset_page(rows, page_size)
+
+
+# AsyncSession counterparts, for select() statements of columns (row tuples).
+# Query building is shared with the sync helpers above; only execution differs.
+
+async def count_total_async(db: AsyncSession, statement: Select, mode: TotalMode) -> int | None:
+    if mode == TotalMode.NONE:
+        return None
+
+    count = select(func.count()).select_from(statement.order_by(None).subquery())
+    if mode == TotalMode.EXACT:
+        return await db.scalar(count)
+
+    key = _count_signature(statement, db.bind.dialect)
+    total = count_cache.get(key)
+    if total is None:
+        total = _plan_rows(await db.scalar(_Explain(statement)))
+        if total <= settings.COUNT_ESTIMATE_EXACT_BELOW:
+            total = await db.scalar(count)
+        count_cache.set(key, total)
+    return total
+
+
+async def paginate_offset_async(
+    db: AsyncSession,
+    statement: Select,
+    offset: int,
+    page_size: int,
+    total_mode: TotalMode = TotalMode.EXACT,
+):
+    total = await count_total_async(db, statement.order_by(None), total_mode)
+
+    rows = (await db.execute(apply_pagination(statement, offset, page_size + 1))).all()
+    items = rows[:page_size]
+    return items, total, len(rows) > page_size
+
+
+async def paginate_keyset_async(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    cursor: str | None,
+    page_size: int,
+    sort_order: str = "desc",
+):
+    statement = _keyset_order(statement, model, cursor, sort_order).limit(page_size + 1)
+    return _keyset_page((await db.execute(statement)).all(), page_size)
@@ -1,4 +1,49 @@
 from slowapi import Limiter
+from slowapi.middleware import _find_route_handler, _should_exempt, async_check_limits
 from slowapi.util import get_remote_address
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 limiter = Limiter(key_func=get_remote_address)
+
+
+class RateLimitMiddleware:
+    """SlowAPIMiddleware as plain ASGI.
+
+    Same checks (default limits for routes without their own decorator),
+    but the rate-limit headers are added to http.response.start and the body
+    is passed through untouched. slowapi's own SlowAPIASGIMiddleware resends
+    the start message before every body chunk, which breaks streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        app = scope["app"]
+        limiter: Limiter = app.state.limiter
+        handler = _find_route_handler(app.routes, scope) if limiter.enabled else None
+        if not limiter.enabled or _should_exempt(limiter, handler):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive=receive, send=send)
+        error_response, inject_headers = await async_check_limits(limiter, request, handler, app)
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
+        if not inject_headers:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                limiter._inject_asgi_headers(MutableHeaders(scope=message), request.state.view_rate_limit)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
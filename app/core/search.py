@@ -0,0 +1,52 @@
+import re
+
+from sqlalchemy import case, cast, func, literal, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Query
+
+# "simple" keeps SKUs, brand names and mixed-language names as typed: no
+# stemming, no stop words
+SEARCH_CONFIG = "simple"
+
+
+def search_vector_sql(*weighted_columns: tuple[str, str]) -> str:
+    """SQL for a generated tsvector column over (column, weight) pairs."""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_tsquery(term: str) -> str | None:
+    """'red wid' -> 'red:* & wid:*', so every word may still be half-typed."""
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def apply_text_search(query: Query, vector_column, term: str, prefix_column=None):
+    """Filter on the tsvector (and a case-insensitive prefix of prefix_column).
+
+    Returns the filtered query and a rank expression to order by; prefix
+    matches on prefix_column rank above any text match.
+    """
+    tsquery_text = prefix_tsquery(term)
+    tsquery = func.to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), tsquery_text) if tsquery_text else None
+
+    conditions, rank = [], literal(0.0)
+    if tsquery is not None:
+        conditions.append(vector_column.op("@@")(tsquery))
+        rank = func.ts_rank_cd(vector_column, tsquery)
+    if prefix_column is not None:
+        is_prefix = func.lower(prefix_column).like(escape_like(term.lower()) + "%", escape="\\")
+        conditions.append(is_prefix)
+        rank = rank + case((is_prefix, 1.0), else_=0.0)
+
+    if not conditions:
+        return query.filter(literal(False)), rank
+    return query.filter(or_(*conditions)), rank
@@ -1,73 +1,160 @@
 from datetime import datetime, timedelta,timezone
 from uuid import uuid4
-from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.common.enums import JwtBackend
+from app.core.cache import make_cache
 from app.core.config import settings
-import hmac,hashlib
+from app.core.password_pool import password_pool
+import hmac,hashlib,time
 from datetime import datetime, timezone
 
+if settings.JWT_BACKEND == JwtBackend.PYJWT:
+    try:
+        import jwt as pyjwt
+    except ImportError as e:
+        raise RuntimeError("JWT_BACKEND=pyjwt requires the 'PyJWT' package") from e
+
+    JWT_ERRORS = (pyjwt.PyJWTError,)
+
+    def _jwt_encode(claims: dict, secret: str) -> str:
+        return pyjwt.encode(claims, secret, algorithm=settings.ALGORITHM)
+
+    def _jwt_decode(token: str, secret: str) -> dict:
+        return pyjwt.decode(
+            token,
+            secret,
+            algorithms=[settings.ALGORITHM],
+            audience=settings.JWT_AUDIENCE,
+            issuer=settings.JWT_ISSUER,
+            options={"require": ["exp", "aud", "iss"]},
+        )
+else:
+    from jose import jwt, JWTError
+
+    JWT_ERRORS = (JWTError,)
+
+    def _jwt_encode(claims: dict, secret: str) -> str:
+        return jwt.encode(claims, secret, algorithm=settings.ALGORITHM)
+
+    def _jwt_decode(token: str, secret: str) -> dict:
+        return jwt.decode(
+            token,
+            secret,
+            algorithms=[settings.ALGORITHM],
+            audience=settings.JWT_AUDIENCE,
+            issuer=settings.JWT_ISSUER,
+            options={"require_aud": True, "require_iss": True},
+        )
+
+# Verified access-token claims keyed by a hash of the token, each entry
+# expiring with its token: a client reusing one token for its whole lifetime
+# pays for the signature check once per worker.
+token_cache = make_cache(
+    "tokens",
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    local=True,
+)
+
 def exp_to_datetime(exp: int) -> datetime:
     return datetime.fromtimestamp(exp, tz=timezone.utc)
 
 pwd_context = CryptContext(
     schemes=["argon2"],
-    deprecated="auto"
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
 )
 
-def hash_password(password: str) -> str:
+# The hashing itself runs in password_pool's worker processes. They import
+# this module and build the same pwd_context from the same settings, so only
+# these module-level functions and their string arguments are sent across.
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
+def _verify(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
 
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def hash_password(password: str) -> str:
+    return password_pool.run(_hash, password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return password_pool.run(_verify, password, hashed_password)
+
+
+def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify, and return a new hash too if the stored one uses outdated parameters."""
+    return password_pool.run(_verify_and_update, password, hashed_password)
+
 def _now() -> datetime:
     return datetime.now(timezone.utc)
 
-def create_access_token(
+def _issue_token(
     data: dict,
-    expires_delta: timedelta | None = None
-) -> str:
-    to_encode = data.copy()
-
-    now = datetime.now(timezone.utc)
-    expire = now + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-
-    to_encode.update({
-        "type": "access",
-        "exp": int(expire.timestamp()),
-        "iat": int(now.timestamp()),
+    token_type: str,
+    secret: str,
+    lifetime: timedelta,
+) -> tuple[str, dict]:
+    """Sign a token and return it with its claims, so callers never decode what they just minted."""
+    now = _now()
+    claims = {
+        **data,
+        "type": token_type,
+        "exp": int((now + lifetime).timestamp()),
+        # sub-second, so a revocation cutoff separates tokens issued within the same second
+        "iat": now.timestamp(),
         "nbf": int(now.timestamp()),
         "jti": str(uuid4()),
         "iss": settings.JWT_ISSUER,
         "aud": settings.JWT_AUDIENCE,
-    })
+    }
+    return _jwt_encode(claims, secret), claims
 
-    return jwt.encode(
-        to_encode,
+
+def issue_access_token(data: dict, expires_delta: timedelta | None = None) -> tuple[str, dict]:
+    return _issue_token(
+        data,
+        "access",
         settings.ACCESS_TOKEN_SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
 
-def decode_access_token(token: str, token_type: str = "access") -> dict:
-    try:
-        secret = (
-            settings.ACCESS_TOKEN_SECRET_KEY
-            if token_type == "access"
-            else settings.REFRESH_TOKEN_SECRET_KEY
-        )
+def issue_refresh_token(data: dict) -> tuple[str, dict]:
+    return _issue_token(
+        data,
+        "refresh",
+        settings.REFRESH_TOKEN_SECRET_KEY,
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
 
-        payload = jwt.decode(
-            token,
-            secret,
-            algorithms=[settings.ALGORITHM],
-            audience=settings.JWT_AUDIENCE,
-            issuer=settings.JWT_ISSUER,
-            options={"require_aud": True, "require_iss": True},
-        )
-    except JWTError:
+
+def create_access_token(
+    data: dict,
+    expires_delta: timedelta | None = None
+) -> str:
+    return issue_access_token(data, expires_delta)[0]
+
+
+def _verify_token(token: str, token_type: str) -> dict:
+    secret = (
+        settings.ACCESS_TOKEN_SECRET_KEY
+        if token_type == "access"
+        else settings.REFRESH_TOKEN_SECRET_KEY
+    )
+    try:
+        payload = _jwt_decode(token, secret)
+    except JWT_ERRORS:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
@@ -80,29 +167,27 @@ def decode_access_token(token: str, token_type: str = "access") -> dict:
         )
 
     return payload
-    
 
-def create_refresh_token(data: dict) -> str:
-    to_encode = data.copy()
 
-    now = datetime.now(timezone.utc)
-    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+def decode_access_token(token: str, token_type: str = "access") -> dict:
+    """Verified claims of token; access tokens are served from token_cache after the first check."""
+    if token_type != "access" or settings.TOKEN_CACHE_MAX_SIZE <= 0:
+        return _verify_token(token, token_type)
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = _verify_token(token, token_type)
+    remaining = payload["exp"] - time.time()
+    if remaining > 0:
+        token_cache.set(key, payload, ttl=remaining)
+    return payload
 
-    to_encode.update({
-        "type": "refresh",
-        "exp": int(expire.timestamp()),
-        "iat": int(now.timestamp()),
-        "nbf": int(now.timestamp()),
-        "jti": str(uuid4()),
-        "iss": settings.JWT_ISSUER,
-        "aud": settings.JWT_AUDIENCE,
-    })
 
-    return jwt.encode(
-        to_encode,
-        settings.REFRESH_TOKEN_SECRET_KEY, 
-        algorithm=settings.ALGORITHM
-    )
+def create_refresh_token(data: dict) -> str:
+    return issue_refresh_token(data)[0]
 
 def hash_refresh_token(raw_token: str) -> str:
     return hmac.new(
@@ -1,9 +1,12 @@
 from app.core.database import Base
+from app.core.generations import TableGeneration
 
 from app.users.models import User
 from app.products.models import Product
 from app.categories.models import Category
 from app.suppliers.models import Supplier
-from app.inventory.models import Inventory
+from app.inventory.models import Inventory, StockBalance, InventoryDailyRollup, LowStock, LowStockEvent
 from app.audit.models import AuditLog  
-from app.auth.models import RefreshToken
+from app.auth.models import RefreshToken, LoginAttempt, TokenRevocation
+
+import app.reports.invalidation  # noqa: F401  (report cache invalidation listeners)
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException,Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.responses import row_dicts, rows_response
+from app.core.dependencies import require_role
+from app.auth.service import get_current_user_async
+
+from app.inventory import async_service
+from app.inventory.schemas import InventoryCreate, InventoryOut, InventoryBatchCreate, InventoryBatchResult, InventoryList
+from app.common.enums import Role,ChangeType,TotalMode
+from typing import Optional
+from datetime import datetime
+
+router = APIRouter(
+    prefix="/async/inventory",
+    tags=["Inventory (async)"],
+    dependencies=[
+        Depends(require_role([
+           Role.ADMIN,
+            Role.STAFF
+        ], get_current_user_async))
+    ]
+)
+
+
+@router.post("/", response_model=InventoryOut)
+async def create_inventory(
+    data: InventoryCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async),
+):
+    try:
+        return await async_service.create_inventory_log(
+            db=db,
+            data=data,
+            current_user=current_user
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/batch", response_model=InventoryBatchResult)
+async def create_inventory_batch(
+    data: InventoryBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async),
+):
+    return await async_service.create_inventory_batch(
+        db=db,
+        data=data,
+        current_user=current_user
+    )
+
+@router.get("/history", response_model=InventoryList)
+async def get_history(
+    change_type: ChangeType | None = Query(None),
+    product_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value to start"),
+    total: Optional[TotalMode] = Query(None, description="exact (default for pages), estimated, or none (default for cursors)"),
+    include_total: Optional[bool] = Query(None, deprecated=True),
+    db: AsyncSession = Depends(get_async_db),
+):
+    page = await async_service.get_inventory_logs(
+        db,
+        change_type=change_type,
+        product_id=product_id,
+        user_id=user_id,
+        supplier_id=supplier_id,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        total_mode=total,
+        include_total=include_total,
+    )
+    page["items"] = row_dicts(page["items"], InventoryOut)
+    return rows_response(page)
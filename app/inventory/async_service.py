@@ -0,0 +1,93 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.inventory import service
+from app.inventory.models import Inventory, StockBalance
+from app.inventory.schemas import InventoryCreate, InventoryBatchCreate, InventoryOut
+from app.common.enums import TotalMode
+from app.core.query_utils import count_total_async, paginate_keyset_async, paginate_offset_async
+from app.core.responses import schema_columns
+
+# Reads are native AsyncSession queries built with the same filter and order
+# helpers as the sync service. Writes reuse the sync service through
+# AsyncSession.run_sync: the ORM code runs in a greenlet on the event loop
+# and every query awaits asyncpg, so the locking and single-commit logic
+# stays in one place.
+
+
+async def get_current_stock(db: AsyncSession, product_id: int):
+    balance = await db.get(StockBalance, product_id)
+    return balance.quantity if balance else 0
+
+
+async def create_inventory_log(db: AsyncSession, data: InventoryCreate, current_user) -> InventoryOut:
+    return await db.run_sync(service.create_inventory_log, data, current_user)
+
+
+async def create_inventory_batch(db: AsyncSession, data: InventoryBatchCreate, current_user) -> dict:
+    return await db.run_sync(service.create_inventory_batch, data, current_user)
+
+
+async def get_inventory_logs(
+    db: AsyncSession,
+    change_type=None,
+    product_id=None,
+    user_id=None,
+    supplier_id=None,
+    start_date=None,
+    end_date=None,
+    page: int = 1,
+    page_size: int = 20,
+    offset: int | None = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    cursor: str | None = None,
+    total_mode: TotalMode | None = None,
+    include_total: bool | None = None,
+) -> dict:
+    """get_inventory_logs(rows=True) on an AsyncSession: items are row tuples of InventoryOut's columns."""
+    if total_mode is None and include_total is not None:
+        total_mode = TotalMode.EXACT if include_total else TotalMode.NONE
+
+    q = service.filter_inventory_logs(
+        select(*schema_columns(Inventory, InventoryOut)),
+        change_type=change_type,
+        product_id=product_id,
+        user_id=user_id,
+        supplier_id=supplier_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    if cursor is not None:
+        if sort_by != "created_at":
+            raise HTTPException(status_code=400, detail="Cursor pagination requires sort_by=created_at")
+
+        total = await count_total_async(db, q, total_mode or TotalMode.NONE)
+        items, next_cursor = await paginate_keyset_async(db, q, Inventory, cursor, page_size, sort_order)
+
+        return {
+            "total": total,
+            "page": None,
+            "page_size": page_size,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "items": items
+        }
+
+    q = service.order_inventory_logs(q, sort_by, sort_order)
+
+    if offset is None:
+        offset = (page - 1) * page_size
+
+    items, total, has_next = await paginate_offset_async(db, q, offset, page_size, total_mode or TotalMode.EXACT)
+
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "has_next": has_next,
+        "next_cursor": None,
+        "items": items
+    }
@@ -0,0 +1,552 @@
+"""Maintenance commands for the inventory ledger.
+
+Usage:
+    python -m app.inventory.commands backfill
+    python -m app.inventory.commands reconcile [--fix]
+    python -m app.inventory.commands rebuild-rollups
+    python -m app.inventory.commands sync-low-stock
+    python -m app.inventory.commands ensure-partitions [--months-ahead N]
+    python -m app.inventory.commands explain [--rows N]
+    python -m app.inventory.commands bench-movements [--workers N] [--movements N] [--audit-mode MODE]
+    python -m app.inventory.commands bench-partitions [--rows N] [--repeat N]
+"""
+import argparse
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+import app.db.base  # noqa: F401  (registers every model with the mapper)
+from app.audit.writer import audit_writer
+from app.common.enums import AuditMode, ChangeType, Role
+from app.core.benchmark import count_statements, format_timing, summarize, timed
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.partitions import ensure_partitions
+from app.core.rate_limiter import limiter
+from app.core.security import create_access_token
+from app.inventory.models import Inventory, InventoryDailyRollup, StockBalance
+from app.inventory.service import (
+    ensure_inventory_partitions,
+    filter_inventory_logs,
+    order_inventory_logs,
+    update_low_stock,
+)
+from app.products.models import Product
+from app.reports.invalidation import mark_reports_stale
+from app.reports.service import CURRENT_STOCK, LOW_STOCK, inventory_range_statements, top_products_statement
+from app.users.models import User
+
+LEDGER_SUM_SQL = """
+    SELECT p.id AS product_id,
+           COALESCE(SUM(CASE WHEN i.change_type = 'IN' THEN i.quantity ELSE -i.quantity END), 0) AS ledger_stock
+    FROM products p
+    LEFT JOIN inventory i ON i.product_id = p.id
+    GROUP BY p.id
+"""
+
+
+def backfill_stock_balances(db: Session) -> int:
+    count = refresh_stock_balances(db)
+    db.commit()
+    return count
+
+
+def refresh_stock_balances(db: Session) -> int:
+    """Rewrite every balance and the low_stock set from the ledger, without committing."""
+    # block concurrent ledger inserts so the snapshot and the balances agree
+    db.execute(text("LOCK TABLE inventory IN SHARE MODE"))
+    result = db.execute(
+        text(
+            f"""
+            INSERT INTO stock_balances (product_id, quantity, updated_at)
+            SELECT product_id, ledger_stock, now() FROM ({LEDGER_SUM_SQL}) AS ledger
+            ON CONFLICT (product_id) DO UPDATE
+            SET quantity = EXCLUDED.quantity, updated_at = EXCLUDED.updated_at
+            """
+        )
+    )
+    sync_low_stock(db)
+    mark_reports_stale(db)
+    return result.rowcount
+
+
+def sync_low_stock(db: Session):
+    """Bring low_stock in line with every balance, emitting events for changes."""
+    balances = db.query(StockBalance).order_by(StockBalance.product_id).with_for_update().all()
+    update_low_stock(db, {b.product_id: b.quantity for b in balances})
+
+
+def reconcile_stock_balances(db: Session, fix: bool = False) -> list[dict]:
+    rows = db.execute(
+        text(
+            f"""
+            SELECT ledger.product_id, ledger.ledger_stock, b.quantity AS balance_stock
+            FROM ({LEDGER_SUM_SQL}) AS ledger
+            LEFT JOIN stock_balances b ON b.product_id = ledger.product_id
+            WHERE b.product_id IS NULL OR abs(b.quantity - ledger.ledger_stock) > 1e-9
+            ORDER BY ledger.product_id
+            """
+        )
+    ).all()
+
+    mismatches = [
+        {
+            "product_id": r.product_id,
+            "ledger_stock": float(r.ledger_stock),
+            "balance_stock": float(r.balance_stock) if r.balance_stock is not None else None,
+        }
+        for r in rows
+    ]
+
+    if fix and mismatches:
+        backfill_stock_balances(db)
+
+    return mismatches
+
+
+def rebuild_daily_rollups(db: Session) -> int:
+    count = refresh_daily_rollups(db)
+    db.commit()
+    return count
+
+
+def refresh_daily_rollups(db: Session) -> int:
+    """Rewrite inventory_daily_rollup from the ledger, without committing."""
+    db.execute(text("LOCK TABLE inventory IN SHARE MODE"))
+    db.execute(text("DELETE FROM inventory_daily_rollup"))
+    result = db.execute(
+        text(
+            """
+            INSERT INTO inventory_daily_rollup (product_id, day, in_qty, out_qty, movement_count)
+            SELECT product_id,
+                   (created_at AT TIME ZONE 'UTC')::date,
+                   COALESCE(SUM(quantity) FILTER (WHERE change_type = 'IN'), 0),
+                   COALESCE(SUM(quantity) FILTER (WHERE change_type = 'OUT'), 0),
+                   COUNT(*)
+            FROM inventory
+            GROUP BY 1, 2
+            """
+        )
+    )
+    mark_reports_stale(db)
+    return result.rowcount
+
+
+SEED_PREFIX = "explain-seed"
+
+
+def seed_ledger(db: Session, rows: int) -> dict:
+    """Seed rows ledger movements spread over two years, without committing.
+
+    They belong to throwaway users, suppliers and products named after
+    SEED_PREFIX; returns one id of each.
+    """
+    # partitions for the seeded two years; rolled back along with the rows
+    ensure_partitions(
+        db.connection(),
+        Inventory.__tablename__,
+        months_ahead=0,
+        start=datetime.now(timezone.utc) - timedelta(days=731),
+    )
+    db.execute(text(
+        f"""
+        INSERT INTO users (email, hashed_password, role, is_active, is_verified, failed_login_count)
+        SELECT '{SEED_PREFIX}-' || g || '@example.invalid', '-', 'STAFF', false, false, 0
+        FROM generate_series(1, 50) g
+        """
+    ))
+    db.execute(text(
+        f"""
+        INSERT INTO suppliers (name, is_deleted)
+        SELECT '{SEED_PREFIX}-' || g, true FROM generate_series(1, 50) g
+        """
+    ))
+    db.execute(text(
+        f"""
+        INSERT INTO products (name, sku, unit, min_quantity, is_deleted, price)
+        SELECT '{SEED_PREFIX}-' || g, '{SEED_PREFIX}-' || g, 'pc', 0, true, 1
+        FROM generate_series(1, 500) g
+        """
+    ))
+    db.execute(text(
+        f"""
+        WITH ids AS (
+            SELECT
+                (SELECT array_agg(id) FROM users WHERE email LIKE '{SEED_PREFIX}-%') AS users,
+                (SELECT array_agg(id) FROM suppliers WHERE name LIKE '{SEED_PREFIX}-%') AS suppliers,
+                (SELECT array_agg(id) FROM products WHERE sku LIKE '{SEED_PREFIX}-%') AS products
+        )
+        INSERT INTO inventory (product_id, change_type, quantity, user_id, supplier_id, created_at)
+        SELECT
+            ids.products[1 + g % 500],
+            CASE WHEN g % 2 = 0 THEN 'IN' ELSE 'OUT' END::changetype,
+            1 + g % 10,
+            ids.users[1 + g % 50],
+            CASE WHEN g % 4 = 0 THEN ids.suppliers[1 + g % 50] END,
+            now() - (g % 730) * interval '1 day' - (g % 1440) * interval '1 minute'
+        FROM ids, generate_series(1, :rows) g
+        """
+    ), {"rows": rows})
+    db.execute(text("ANALYZE inventory"))
+
+    return db.execute(text(
+        f"""
+        SELECT
+            (SELECT min(id) FROM users WHERE email LIKE '{SEED_PREFIX}-%') AS user_id,
+            (SELECT min(id) FROM suppliers WHERE name LIKE '{SEED_PREFIX}-%') AS supplier_id,
+            (SELECT min(id) FROM products WHERE sku LIKE '{SEED_PREFIX}-%') AS product_id
+        """
+    )).mappings().one()
+
+
+LEDGER = Inventory.__tablename__
+ROLLUP = InventoryDailyRollup.__tablename__
+
+
+def _hot_queries(db: Session, ids: dict) -> dict[str, tuple]:
+    """Each hot query with the tables it must not sequentially scan.
+
+    The whole-table reports read every balance, low_stock or rollup row by
+    design, so a Seq Scan there is the right plan; for them only the ledger
+    is guarded, since scanning it means the report fell back to
+    aggregating movements.
+    """
+    now = datetime.now(timezone.utc)
+    history = lambda **filters: order_inventory_logs(
+        filter_inventory_logs(db.query(Inventory), **filters)
+    ).limit(20)
+
+    queries = {
+        "history": (history(), [LEDGER]),
+        "history_by_product": (history(product_id=ids["product_id"]), [LEDGER]),
+        "history_by_user": (history(user_id=ids["user_id"]), [LEDGER]),
+        "history_by_supplier": (history(supplier_id=ids["supplier_id"]), [LEDGER]),
+        "history_by_change_type_and_range": (
+            history(change_type="IN", start_date=now - timedelta(days=7), end_date=now),
+            [LEDGER],
+        ),
+        "current_stock": (CURRENT_STOCK, [LEDGER]),
+        "low_stock": (LOW_STOCK, [LEDGER]),
+        "top_in": (top_products_statement("IN"), [LEDGER]),
+        "top_out": (top_products_statement("OUT"), [LEDGER]),
+    }
+    # a range with partial days at both ends yields all three of its statements
+    range_parts = ["inventory_range_days", "inventory_range_first_day", "inventory_range_last_day"]
+    statements = inventory_range_statements(now - timedelta(days=30, hours=5), now)
+    for name, statement in zip(range_parts, statements):
+        queries[name] = (statement, [LEDGER, ROLLUP])
+    return queries
+
+
+def _seq_scans(plan: dict, table: str) -> int:
+    # the ledger's partitions show up under their own names
+    relation = plan.get("Relation Name") or ""
+    scans_table = relation == table or relation.startswith(f"{table}_p") or relation == f"{table}_default"
+    count = int(plan.get("Node Type") == "Seq Scan" and scans_table)
+    return count + sum(_seq_scans(p, table) for p in plan.get("Plans", []))
+
+
+def _literal_sql(db: Session, query) -> str:
+    statement = getattr(query, "statement", query)
+    return str(statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain_hot_queries(db: Session, rows: int = 50000) -> dict[str, list[str]]:
+    """EXPLAIN the history and report queries against a throwaway seeded dataset.
+
+    Returns, per query, the guarded tables it sequentially scans. The seed
+    rows, and the balances and rollups rebuilt for them, are inserted in the
+    current transaction and rolled back afterwards, so this is safe to run
+    against a development database.
+    """
+    try:
+        ids = seed_ledger(db, rows)
+        refresh_stock_balances(db)
+        refresh_daily_rollups(db)
+        db.execute(text("ANALYZE products, stock_balances, low_stock, inventory_daily_rollup"))
+        results = {}
+        for name, (query, guarded) in _hot_queries(db, ids).items():
+            sql = _literal_sql(db, query)
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            results[name] = [table for table in guarded if _seq_scans(plan[0]["Plan"], table)]
+        return results
+    finally:
+        db.rollback()
+
+
+def _range_queries(db: Session, ids: dict) -> dict:
+    now = datetime.now(timezone.utc)
+    since = lambda days: {"start_date": now - timedelta(days=days), "end_date": now}
+    totals = lambda days: filter_inventory_logs(
+        db.query(
+            func.sum(Inventory.quantity).filter(Inventory.change_type == ChangeType.IN),
+            func.sum(Inventory.quantity).filter(Inventory.change_type == ChangeType.OUT),
+        ),
+        **since(days),
+    )
+    history = lambda days, sort_by="created_at", **filters: order_inventory_logs(
+        filter_inventory_logs(db.query(Inventory), **since(days), **filters), sort_by
+    ).limit(20)
+
+    return {
+        "totals_last_30_days": totals(30),
+        "totals_last_90_days": totals(90),
+        "history_last_30_days_by_quantity": history(30, sort_by="quantity"),
+        "history_by_product_last_90_days": history(90, product_id=ids["product_id"]),
+        "history_by_user_last_30_days": history(30, user_id=ids["user_id"]),
+    }
+
+
+def _partitions_scanned(plan: dict, table: str) -> set[str]:
+    relation = plan.get("Relation Name") or ""
+    scanned = {relation} if relation.startswith(f"{table}_p") or relation == f"{table}_default" else set()
+    return scanned.union(*(_partitions_scanned(p, table) for p in plan.get("Plans", [])))
+
+
+def bench_partitions(db: Session, rows: int = 1000000, repeat: int = 10) -> dict[str, dict]:
+    """Time date-bounded ledger queries against an unpartitioned copy of the same seeded ledger.
+
+    The copy has the same indexes. The seed rows and the copy are created
+    in one transaction and rolled back afterwards.
+    """
+    table = Inventory.__tablename__
+    try:
+        ids = seed_ledger(db, rows)
+        # a regular table, not TEMP: temp tables use local buffers and never run parallel
+        db.execute(text(f"CREATE TABLE {table}_flat (LIKE {table} INCLUDING DEFAULTS INCLUDING INDEXES)"))
+        db.execute(text(f"INSERT INTO {table}_flat SELECT * FROM {table}"))
+        db.execute(text(f"ANALYZE {table}_flat"))
+        partitions = db.execute(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = CAST(:table AS regclass)"), {"table": table}
+        ).scalar()
+
+        results = {}
+        for name, query in _range_queries(db, ids).items():
+            sql = _literal_sql(db, query)
+            flat_sql = re.sub(rf"\b{table}\b", f"{table}_flat", sql)
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            run = lambda statement: db.execute(text(statement)).all()
+            results[name] = {
+                "same": run(sql) == run(flat_sql),
+                "scanned": len(_partitions_scanned(plan[0]["Plan"], table)),
+                "partitions": partitions,
+                "partitioned": timed(lambda: run(sql), repeat),
+                "flat": timed(lambda: run(flat_sql), repeat),
+            }
+        return results
+    finally:
+        db.rollback()
+
+
+BENCH_PREFIX = "bench-movements"
+
+
+def _bench_cleanup(db: Session, product_id: int, user_id: int):
+    # buffered audit rows are flushed first, so they can be deleted too
+    audit_writer.stop()
+    params = {"product_id": product_id, "user_id": user_id}
+    for table in ("inventory", "inventory_daily_rollup", "low_stock", "low_stock_events", "stock_balances"):
+        db.execute(text(f"DELETE FROM {table} WHERE product_id = :product_id"), params)
+    db.execute(text("DELETE FROM audit_logs WHERE user_id = :user_id"), params)
+    db.execute(text("DELETE FROM products WHERE id = :product_id"), params)
+    db.execute(text("DELETE FROM users WHERE id = :user_id"), params)
+    db.commit()
+
+
+def bench_movements(
+    db: Session,
+    workers: int = 8,
+    movements: int = 400,
+    audit_mode: AuditMode | None = None,
+) -> dict:
+    """Race movements POST /inventory/ OUT requests of one unit, on workers threads, for a product holding half that.
+
+    The requests go through the app in-process (routing, auth, validation,
+    response serialization), without a network hop. Exactly half must be
+    applied and the stock must end at zero, matching the ledger.
+    audit_mode overrides AUDIT_MODE for the run and rate limits are
+    switched off. The throwaway product, user and everything they left
+    behind are deleted afterwards.
+    """
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError as e:
+        raise RuntimeError("bench-movements requires the 'httpx' package") from e
+    from app.main import app
+
+    configured_mode = settings.AUDIT_MODE
+    if audit_mode is not None:
+        settings.AUDIT_MODE = audit_mode
+    limiter_enabled, limiter.enabled = limiter.enabled, False
+    try:
+        with TestClient(app) as client:
+            return _bench_movements(db, client, workers, movements)
+    finally:
+        limiter.enabled = limiter_enabled
+        settings.AUDIT_MODE = configured_mode
+
+
+def _bench_movements(db: Session, client, workers: int, movements: int) -> dict:
+    stock = movements // 2
+    user = User(email=f"{BENCH_PREFIX}@example.invalid", hashed_password="-", role=Role.STAFF, is_active=True)
+    product = Product(name=BENCH_PREFIX, sku=BENCH_PREFIX, unit="pc", min_quantity=0, price=1, is_deleted=True)
+    db.add_all([user, product])
+    db.flush()
+    product_id, user_id = product.id, user.id
+    db.add(StockBalance(product_id=product_id, quantity=0))
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    def post(change_type: ChangeType, quantity: float) -> int:
+        return client.post(
+            "/inventory/",
+            json={"product_id": product_id, "change_type": change_type.value, "quantity": quantity},
+            headers=headers,
+        ).status_code
+
+    def move():
+        started = time.perf_counter()
+        status_code = post(ChangeType.OUT, 1)
+        if status_code not in (200, 400):
+            raise RuntimeError(f"POST /inventory/ answered {status_code}")
+        return status_code == 200, time.perf_counter() - started
+
+    try:
+        if post(ChangeType.IN, stock) != 200:
+            raise RuntimeError("could not stock the benchmark product")
+
+        with count_statements(engine) as counts, ThreadPoolExecutor(workers) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(lambda _: move(), range(movements)))
+            elapsed = time.perf_counter() - started
+
+        applied = sum(1 for ok, _ in results if ok)
+        final_stock = db.get(StockBalance, product_id).quantity
+        ledger_stock = db.execute(
+            text(f"SELECT ledger_stock FROM ({LEDGER_SUM_SQL}) AS ledger WHERE product_id = :product_id"),
+            {"product_id": product_id},
+        ).scalar()
+        db.rollback()
+        return {
+            "stock": stock,
+            "applied": applied,
+            "rejected": movements - applied,
+            "final_stock": final_stock,
+            "ledger_stock": float(ledger_stock),
+            "commits_per_movement": counts["commits"] / applied if applied else 0.0,
+            "timing": summarize([duration for _, duration in results], elapsed),
+        }
+    finally:
+        db.rollback()
+        _bench_cleanup(db, product_id, user_id)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.inventory.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="rebuild stock_balances from the inventory ledger")
+    reconcile = sub.add_parser("reconcile", help="compare stock_balances against the ledger")
+    reconcile.add_argument("--fix", action="store_true", help="rewrite balances that drifted")
+    sub.add_parser("rebuild-rollups", help="rebuild inventory_daily_rollup from the ledger")
+    sub.add_parser("sync-low-stock", help="recompute the low_stock set from stock_balances")
+    partitions = sub.add_parser("ensure-partitions", help="create monthly ledger partitions up to N months ahead")
+    partitions.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    explain = sub.add_parser("explain", help="fail if the history or report queries fall back to sequential scans")
+    explain.add_argument("--rows", type=int, default=50000, help="number of seeded ledger rows")
+    bench = sub.add_parser("bench-movements", help="race parallel POST /inventory/ OUT requests and fail on any oversell")
+    bench.add_argument("--workers", type=int, default=8)
+    bench.add_argument("--movements", type=int, default=400, help="OUT requests against half as much stock")
+    bench.add_argument(
+        "--audit-mode",
+        choices=[mode.value for mode in AuditMode] + ["all"],
+        default="all",
+        help="audit mode to run with; all runs each in turn",
+    )
+    pruning = sub.add_parser("bench-partitions", help="time date-bounded ledger queries against an unpartitioned copy")
+    pruning.add_argument("--rows", type=int, default=1000000, help="number of seeded ledger rows")
+    pruning.add_argument("--repeat", type=int, default=10, help="runs of each query")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            count = backfill_stock_balances(db)
+            print(f"backfilled {count} stock balances")
+            return 0
+
+        if args.command == "rebuild-rollups":
+            count = rebuild_daily_rollups(db)
+            print(f"rebuilt {count} daily rollup rows")
+            return 0
+
+        if args.command == "sync-low-stock":
+            sync_low_stock(db)
+            db.commit()
+            print("low_stock synced")
+            return 0
+
+        if args.command == "ensure-partitions":
+            created = ensure_inventory_partitions(db.connection(), months_ahead=args.months_ahead)
+            db.commit()
+            for name in created:
+                print(f"created {name}")
+            print(f"{len(created)} partitions created")
+            return 0
+
+        if args.command == "explain":
+            results = explain_hot_queries(db, rows=args.rows)
+            for name, tables in results.items():
+                print(f"{'SEQ SCAN' if tables else 'ok':<8} {name}" + (f" ({', '.join(tables)})" if tables else ""))
+            return 1 if any(results.values()) else 0
+
+        if args.command == "bench-movements":
+            modes = list(AuditMode) if args.audit_mode == "all" else [AuditMode(args.audit_mode)]
+            ok = True
+            for mode in modes:
+                result = bench_movements(db, workers=args.workers, movements=args.movements, audit_mode=mode)
+                passed = (
+                    result["applied"] == result["stock"]
+                    and result["final_stock"] == 0
+                    and result["ledger_stock"] == result["final_stock"]
+                )
+                ok = ok and passed
+                print(
+                    f"{'ok' if passed else 'OVERSOLD':<8} {mode.value}: {result['applied']} applied, "
+                    f"{result['rejected']} rejected for {result['stock']} in stock, "
+                    f"final stock {result['final_stock']:g} (ledger {result['ledger_stock']:g}), "
+                    f"{result['commits_per_movement']:.2f} commits per movement"
+                )
+                print(format_timing(f"  POST /inventory/ on {args.workers} workers", result["timing"]))
+            return 0 if ok else 1
+
+        if args.command == "bench-partitions":
+            results = bench_partitions(db, rows=args.rows, repeat=args.repeat)
+            for name, result in results.items():
+                speedup = result["flat"]["p50_ms"] / result["partitioned"]["p50_ms"]
+                print(
+                    f"{'ok' if result['same'] else 'MISMATCH':<8} {name}: {speedup:.1f}x faster than unpartitioned, "
+                    f"{result['scanned']} of {result['partitions']} partitions scanned"
+                )
+                print(format_timing("  partitioned", result["partitioned"]))
+                print(format_timing("  unpartitioned copy", result["flat"]))
+            return 0 if all(r["same"] for r in results.values()) else 1
+
+        mismatches = reconcile_stock_balances(db, fix=args.fix)
+        for m in mismatches:
+            print(
+                f"product {m['product_id']}: ledger={m['ledger_stock']} balance={m['balance_stock']}"
+            )
+        print(f"{len(mismatches)} mismatched balances" + (" (fixed)" if args.fix and mismatches else ""))
+        return 1 if mismatches and not args.fix else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
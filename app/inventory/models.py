@@ -1,22 +1,100 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime,Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime,Boolean, Index, text, Date
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from sqlalchemy import Enum
-from app.common.enums import ChangeType
+from app.common.enums import ChangeType, LowStockEventType
 
 class Inventory(Base):
     __tablename__ = "inventory"
 
-    id = Column(Integer, primary_key=True)
+    # partitioned by month on created_at, which therefore is part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     change_type = Column(Enum(ChangeType, name="changetype"), nullable=False)
     quantity = Column(Float, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=True)
     description = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     product = relationship("Product")
     user = relationship("User")
-    supplier = relationship("Supplier")
\ No newline at end of file
+    supplier = relationship("Supplier")
+
+    # fetch server-generated columns (created_at) with the INSERT itself
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # per-product history and per-product aggregates (index-only via INCLUDE)
+        Index(
+            "ix_inventory_product_id_created_at",
+            "product_id",
+            "created_at",
+            postgresql_include=["change_type", "quantity"],
+        ),
+        # IN/OUT history filters and top-in/top-out aggregates
+        Index(
+            "ix_inventory_change_type_created_at",
+            "change_type",
+            "created_at",
+            postgresql_include=["product_id", "quantity"],
+        ),
+        # unfiltered history listing, keyset pages and date-range reports
+        Index("ix_inventory_created_at_id", "created_at", "id"),
+        Index("ix_inventory_user_id_created_at", "user_id", "created_at"),
+        Index(
+            "ix_inventory_supplier_id_created_at",
+            "supplier_id",
+            "created_at",
+            postgresql_where=text("supplier_id IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class StockBalance(Base):
+    __tablename__ = "stock_balances"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class InventoryDailyRollup(Base):
+    __tablename__ = "inventory_daily_rollup"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC day of the ledger rows
+    in_qty = Column(Float, nullable=False, default=0)
+    out_qty = Column(Float, nullable=False, default=0)
+    movement_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_inventory_daily_rollup_day", "day"),
+    )
+
+
+class LowStock(Base):
+    """Products whose stock is currently below min_quantity."""
+
+    __tablename__ = "low_stock"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    since = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class LowStockEvent(Base):
+    """Append-only feed of products entering or leaving the low-stock set."""
+
+    __tablename__ = "low_stock_events"
+
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    event = Column(Enum(LowStockEventType, name="lowstockeventtype"), nullable=False)
+    current_stock = Column(Float, nullable=False)
+    min_quantity = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_low_stock_events_product_id_id", "product_id", "id"),
+    )
@@ -2,12 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException,Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import row_dicts, rows_response
 from app.core.dependencies import require_role,pagination_params,sorting_params
 from app.auth.service import get_current_user
 
 from app.inventory import service
-from app.inventory.schemas import InventoryCreate
-from app.common.enums import Role,ChangeType
+from app.inventory.schemas import InventoryCreate, InventoryOut, InventoryBatchCreate, InventoryBatchResult
+from app.common.enums import Role,ChangeType,ExportFormat,TotalMode
 from typing import Optional
 from datetime import datetime
 from app.users.models import User
@@ -25,7 +26,7 @@ router = APIRouter(
 )
 
 
-@router.post("/")
+@router.post("/", response_model=InventoryOut)
 def create_inventory(
     data: InventoryCreate,
     db: Session = Depends(get_db),
@@ -40,6 +41,18 @@ def create_inventory(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/batch", response_model=InventoryBatchResult)
+def create_inventory_batch(
+    data: InventoryBatchCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    return service.create_inventory_batch(
+        db=db,
+        data=data,
+        current_user=current_user
+    )
+
 @router.get("/history", response_model=InventoryList)
 def get_history(
     change_type: ChangeType | None = Query(None),
@@ -50,10 +63,13 @@ def get_history(
     end_date: Optional[datetime] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value to start"),
+    total: Optional[TotalMode] = Query(None, description="exact (default for pages), estimated, or none (default for cursors)"),
+    include_total: Optional[bool] = Query(None, deprecated=True),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return service.get_inventory_logs(
+    page = service.get_inventory_logs(
         db=db,
         change_type=change_type,
         product_id=product_id,
@@ -63,4 +79,30 @@ def get_history(
         end_date=end_date,
         page=page,
         page_size=page_size,
-    )
\ No newline at end of file
+        cursor=cursor,
+        total_mode=total,
+        include_total=include_total,
+        rows=True,
+    )
+    page["items"] = row_dicts(page["items"], InventoryOut)
+    return rows_response(page)
+
+@router.get("/history/export")
+def export_history(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    change_type: ChangeType | None = Query(None),
+    product_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    return service.export_inventory_logs(
+        fmt=format,
+        change_type=change_type,
+        product_id=product_id,
+        user_id=user_id,
+        supplier_id=supplier_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
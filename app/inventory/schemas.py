@@ -1,7 +1,7 @@
 from pydantic import BaseModel, validator,Field
 from typing import Optional,List
 from datetime import datetime
-from app.common.enums import ChangeType
+from app.common.enums import ChangeType, BatchMode
 
 class InventoryCreate(BaseModel):
     product_id: int
@@ -33,7 +33,27 @@ class InventoryOut(BaseModel):
         from_attributes = True
 
 class InventoryList(BaseModel):
-    total: int
-    page: int = Field(ge=1)
+    total: Optional[int] = None
+    page: Optional[int] = Field(default=None, ge=1)
     page_size: int = Field(ge=1, le=100)
-    items: List[InventoryOut]
\ No newline at end of file
+    has_next: bool
+    next_cursor: Optional[str] = None
+    items: List[InventoryOut]
+
+class InventoryBatchCreate(BaseModel):
+    mode: BatchMode = BatchMode.ATOMIC
+    items: List[InventoryCreate] = Field(min_length=1, max_length=1000)
+
+class InventoryBatchLineResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    current_stock: Optional[float] = None
+    error: Optional[str] = None
+
+class InventoryBatchResult(BaseModel):
+    mode: BatchMode
+    committed: bool
+    succeeded: int
+    failed: int
+    results: List[InventoryBatchLineResult]
@@ -1,50 +1,160 @@
+from sqlalchemy import insert, select, delete, cast, func, Date, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.inventory.models import Inventory
+from app.inventory.models import Inventory, StockBalance, InventoryDailyRollup, LowStock, LowStockEvent
 from app.products.models import Product
-from app.inventory.schemas import InventoryCreate
+from app.inventory.schemas import InventoryCreate, InventoryOut, InventoryBatchCreate
+from app.suppliers.models import Supplier
 from app.users.models import User
-from app.audit.service import log_action
-from app.common.enums import ChangeType
-from app.core.query_utils import apply_pagination,apply_sorting
+from app.audit.service import log_action, log_actions
+from app.common.enums import ChangeType, BatchMode, ExportFormat, LowStockEventType, TotalMode
+from app.core.config import settings
+from app.core.export import export_response
+from app.core.partitions import ensure_partitions
+from app.core.responses import schema_columns
+from app.core.query_utils import apply_pagination,apply_sorting,count_total,paginate_keyset,paginate_offset
+
+def ensure_inventory_partitions(conn: Connection, months_ahead: int | None = None) -> list[str]:
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    return ensure_partitions(conn, Inventory.__tablename__, months_ahead)
+
+
+def get_stock_balance(db: Session, product_id: int) -> StockBalance | None:
+    return db.get(StockBalance, product_id)
+
 
 def get_current_stock(db: Session, product_id: int):
-    result = db.query(
-        Inventory.change_type,
-        Inventory.quantity
-    ).filter(Inventory.product_id == product_id).all()
+    balance = get_stock_balance(db, product_id)
+    return balance.quantity if balance else 0
+
+
+def record_daily_rollups(db: Session, movements: list[tuple[int, ChangeType, float]]):
+    """Add (product_id, change_type, quantity) movements to today's rollup rows.
+
+    The day is taken from now() in the same transaction that inserts the
+    ledger rows, so it always matches their created_at.
+    """
+    totals: dict[int, dict] = {}
+    for product_id, change_type, quantity in movements:
+        row = totals.setdefault(product_id, {"in_qty": 0.0, "out_qty": 0.0, "movement_count": 0})
+        row["in_qty" if change_type == ChangeType.IN else "out_qty"] += quantity
+        row["movement_count"] += 1
 
-    stock = 0
-    for change_type, qty in result:
-        if change_type == ChangeType.IN:
-            stock += qty
-        else:
-            stock -= qty
-    return stock
+    if not totals:
+        return
+
+    today = cast(func.timezone("UTC", func.now()), Date)
+    stmt = pg_insert(InventoryDailyRollup).values([
+        {"product_id": product_id, "day": today, **row}
+        for product_id, row in sorted(totals.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[InventoryDailyRollup.product_id, InventoryDailyRollup.day],
+        set_={
+            "in_qty": InventoryDailyRollup.in_qty + stmt.excluded.in_qty,
+            "out_qty": InventoryDailyRollup.out_qty + stmt.excluded.out_qty,
+            "movement_count": InventoryDailyRollup.movement_count + stmt.excluded.movement_count,
+        },
+    )
+    db.execute(stmt)
+
+
+# Serializes low-stock event inserts so event ids are handed out in commit
+# order and a feed reader polling "id > last seen" never skips one. Only
+# transactions that actually cross a threshold take it.
+LOW_STOCK_EVENTS_LOCK = 0x6C6F7773  # "lows"
+
+
+def update_low_stock(
+    db: Session,
+    stock: dict[int, float],
+    min_quantities: dict[int, float] | None = None,
+):
+    """Move products in or out of low_stock after their stock or threshold changed.
+
+    Callers must hold the products' stock_balances row locks. min_quantities
+    overrides the stored thresholds for products whose update is not flushed yet.
+    """
+    if not stock:
+        return
+
+    rows = db.execute(
+        select(Product.id, Product.min_quantity, LowStock.product_id.label("low_product_id"))
+        .outerjoin(LowStock, LowStock.product_id == Product.id)
+        .where(Product.id.in_(stock))
+    ).all()
+
+    events = []
+    for r in rows:
+        min_quantity = (min_quantities or {}).get(r.id, r.min_quantity) or 0
+        is_low = stock[r.id] < min_quantity
+        was_low = r.low_product_id is not None
+        if is_low != was_low:
+            events.append({
+                "product_id": r.id,
+                "event": LowStockEventType.ENTERED if is_low else LowStockEventType.LEFT,
+                "current_stock": stock[r.id],
+                "min_quantity": min_quantity,
+            })
+
+    if not events:
+        return
+
+    entered = [e["product_id"] for e in events if e["event"] == LowStockEventType.ENTERED]
+    left = [e["product_id"] for e in events if e["event"] == LowStockEventType.LEFT]
+    if entered:
+        db.execute(
+            pg_insert(LowStock)
+            .values([{"product_id": product_id} for product_id in entered])
+            .on_conflict_do_nothing()
+        )
+    if left:
+        db.execute(delete(LowStock).where(LowStock.product_id.in_(left)))
+
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOW_STOCK_EVENTS_LOCK})
+    db.execute(insert(LowStockEvent), events)
+
+
+def lock_stock_balance(db: Session, product_id: int) -> StockBalance | None:
+    # SELECT ... FOR UPDATE serializes concurrent movements of the same product
+    return (
+        db.query(StockBalance)
+        .filter(StockBalance.product_id == product_id)
+        .with_for_update()
+        .first()
+    )
 
 
 def create_inventory_log(
     db: Session,
     data: InventoryCreate,
     current_user: User
-):
+) -> InventoryOut:
     if data.quantity <= 0:
         raise ValueError("Quantity must be positive")
 
-    previous_stock = get_current_stock(db, data.product_id)
+    balance = lock_stock_balance(db, data.product_id)
+    if balance is None:
+        raise ValueError("Product not found")
+
+    previous_stock = balance.quantity
 
     if data.change_type == ChangeType.OUT:
         if data.quantity > previous_stock:
             raise ValueError("Not enough stock")
 
+    delta = data.quantity if data.change_type == ChangeType.IN else -data.quantity
+    new_stock = previous_stock + delta
+
     payload = data.dict() 
     payload["user_id"] = current_user.id
     log = Inventory(**payload)
     db.add(log)
-    db.commit()
-    db.refresh(log)
-
-    new_stock = get_current_stock(db, data.product_id)
+    balance.quantity = new_stock
+    record_daily_rollups(db, [(data.product_id, data.change_type, data.quantity)])
+    update_low_stock(db, {data.product_id: new_stock})
 
     log_action(
         db=db,
@@ -58,30 +168,123 @@ def create_inventory_log(
         new_data={
             "quantity": data.quantity,
             "current_stock": new_stock
-        }
+        },
     )
 
-    return log
+    # ledger row, balance and audit row go out in one transaction
+    db.flush()
+    result = InventoryOut.model_validate(log)
+    db.commit()
 
-def get_inventory_logs(
-    db,
+    return result
+
+def create_inventory_batch(
+    db: Session,
+    data: InventoryBatchCreate,
+    current_user: User
+) -> dict:
+    product_ids = sorted({item.product_id for item in data.items})
+    supplier_ids = {item.supplier_id for item in data.items if item.supplier_id is not None}
+
+    # one grouped lock for every affected product, taken in id order to avoid deadlocks
+    balances = {
+        b.product_id: b
+        for b in db.query(StockBalance)
+        .filter(StockBalance.product_id.in_(product_ids))
+        .order_by(StockBalance.product_id)
+        .with_for_update()
+        .all()
+    }
+    known_suppliers = set(
+        db.scalars(select(Supplier.id).where(Supplier.id.in_(supplier_ids))).all()
+    ) if supplier_ids else set()
+
+    stock = {product_id: b.quantity for product_id, b in balances.items()}
+    rows, audit_entries, results = [], [], []
+
+    for index, item in enumerate(data.items):
+        error = None
+        if item.quantity <= 0:
+            error = "Quantity must be positive"
+        elif item.product_id not in stock:
+            error = "Product not found"
+        elif item.supplier_id is not None and item.supplier_id not in known_suppliers:
+            error = "Supplier not found"
+        elif item.change_type == ChangeType.OUT and item.quantity > stock[item.product_id]:
+            error = "Not enough stock"
+
+        if error:
+            results.append({"index": index, "ok": False, "error": error})
+            continue
+
+        previous_stock = stock[item.product_id]
+        delta = item.quantity if item.change_type == ChangeType.IN else -item.quantity
+        stock[item.product_id] = previous_stock + delta
+
+        row = item.dict()
+        row["user_id"] = current_user.id
+        rows.append(row)
+        audit_entries.append({
+            "user_id": current_user.id,
+            "action": "STOCK_IN" if item.change_type == ChangeType.IN else "STOCK_OUT",
+            "entity": "inventory",
+            "entity_id": item.product_id,
+            "old_data": {"previous_stock": previous_stock},
+            "new_data": {"quantity": item.quantity, "current_stock": stock[item.product_id]},
+        })
+        results.append({"index": index, "ok": True, "current_stock": stock[item.product_id]})
+
+    failed = sum(1 for r in results if not r["ok"])
+    committed = bool(rows) and not (failed and data.mode == BatchMode.ATOMIC)
+
+    if not committed:
+        db.rollback()
+        # valid lines of a rejected atomic batch were never applied
+        for r in results:
+            if r["ok"]:
+                r.update(ok=False, error="rolled back")
+                del r["current_stock"]
+    else:
+        ids = iter(
+            db.scalars(
+                insert(Inventory).returning(Inventory.id, sort_by_parameter_order=True),
+                rows,
+            ).all()
+        )
+        for r in results:
+            if r["ok"]:
+                r["id"] = next(ids)
+
+        changed = {
+            product_id: stock[product_id]
+            for product_id, b in balances.items()
+            if stock[product_id] != b.quantity
+        }
+        for product_id, quantity in changed.items():
+            balances[product_id].quantity = quantity
+
+        record_daily_rollups(db, [(r["product_id"], r["change_type"], r["quantity"]) for r in rows])
+        update_low_stock(db, changed)
+        log_actions(db, audit_entries)
+        db.commit()
+
+    return {
+        "mode": data.mode,
+        "committed": committed,
+        "succeeded": len(rows) if committed else 0,
+        "failed": failed,
+        "results": results,
+    }
+
+def filter_inventory_logs(
+    q,
     change_type=None,
     product_id=None,
     user_id=None,
     supplier_id=None,
     start_date=None,
     end_date=None,
-
-    # pagination
-    page: int = 1,
-    page_size: int = 20,
-    offset: int | None = None,
-
-    # sorting
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
 ):
-    q = db.query(Inventory)
     # change_type: Enum or str
     if change_type:
         if isinstance(change_type, str):
@@ -106,28 +309,122 @@ def get_inventory_logs(
     if end_date:
         q = q.filter(Inventory.created_at <= end_date)
 
-    total = q.count()
+    return q
 
-    #  sorting 
+
+def order_inventory_logs(q, sort_by: str = "created_at", sort_order: str = "desc"):
     allowed_sort_fields = {"created_at", "quantity", "id", "product_id", "user_id"}
     if sort_by not in allowed_sort_fields:
         raise HTTPException(status_code=400, detail="Invalid sort_by")
 
     sort_col = getattr(Inventory, sort_by)
+    # id breaks ties so that pages never overlap or skip rows
     if sort_order == "asc":
-        q = q.order_by(sort_col.asc())
-    else:
-        q = q.order_by(sort_col.desc())
+        return q.order_by(sort_col.asc(), Inventory.id.asc())
+    return q.order_by(sort_col.desc(), Inventory.id.desc())
+
+
+def get_inventory_logs(
+    db,
+    change_type=None,
+    product_id=None,
+    user_id=None,
+    supplier_id=None,
+    start_date=None,
+    end_date=None,
+
+    # pagination
+    page: int = 1,
+    page_size: int = 20,
+    offset: int | None = None,
+
+    # sorting
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+
+    # keyset pagination: "" starts from the first page, None keeps page/page_size
+    cursor: str | None = None,
+    total_mode: TotalMode | None = None,
+    # older spelling of total_mode: true -> exact, false -> none
+    include_total: bool | None = None,
+    # row tuples of InventoryOut's columns instead of ORM objects, for rows_response
+    rows: bool = False,
+):
+    if total_mode is None and include_total is not None:
+        total_mode = TotalMode.EXACT if include_total else TotalMode.NONE
+
+    q = filter_inventory_logs(
+        db.query(*schema_columns(Inventory, InventoryOut)) if rows else db.query(Inventory),
+        change_type=change_type,
+        product_id=product_id,
+        user_id=user_id,
+        supplier_id=supplier_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    if cursor is not None:
+        if sort_by != "created_at":
+            raise HTTPException(status_code=400, detail="Cursor pagination requires sort_by=created_at")
+
+        total = count_total(q, total_mode or TotalMode.NONE)
+        items, next_cursor = paginate_keyset(q, Inventory, cursor, page_size, sort_order)
+
+        return {
+            "total": total,
+            "page": None,
+            "page_size": page_size,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "items": items
+        }
+
+    #  sorting 
+    q = order_inventory_logs(q, sort_by, sort_order)
 
     # pagination
     if offset is None:
         offset = (page - 1) * page_size
 
-    items = q.offset(offset).limit(page_size).all()
+    items, total, has_next = paginate_offset(q, offset, page_size, total_mode or TotalMode.EXACT)
 
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
+        "has_next": has_next,
+        "next_cursor": None,
         "items": items
-    }
\ No newline at end of file
+    }
+
+
+INVENTORY_EXPORT_COLUMNS = [
+    "id", "product_id", "change_type", "quantity",
+    "user_id", "supplier_id", "description", "created_at",
+]
+
+
+def export_inventory_logs(
+    fmt: ExportFormat,
+    change_type=None,
+    product_id=None,
+    user_id=None,
+    supplier_id=None,
+    start_date=None,
+    end_date=None,
+):
+    filters = dict(
+        change_type=change_type,
+        product_id=product_id,
+        user_id=user_id,
+        supplier_id=supplier_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    columns = [getattr(Inventory, c) for c in INVENTORY_EXPORT_COLUMNS]
+
+    def build_query(db):
+        q = filter_inventory_logs(db.query(*columns), **filters)
+        return order_inventory_logs(q, "created_at", "asc")
+
+    return export_response(build_query, INVENTORY_EXPORT_COLUMNS, fmt, "inventory_history")
@@ -1,14 +1,23 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from starlette.responses import JSONResponse
 
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, RateLimitMiddleware
 from app.core.security_headers import SecurityHeadersMiddleware
+from app.audit.writer import audit_writer
+from app.core.password_pool import password_pool
+from app.auth.revocation import revocation_index
+from app.audit.service import ensure_audit_partitions
+from app.inventory.service import ensure_inventory_partitions
+from app.core.database import engine
+from app.common.enums import AuditMode
 
 from app.auth.router import router as auth_router
 from app.categories.router import router as categories_router
@@ -17,12 +26,39 @@ from app.inventory.router import router as inventory_router
 from app.suppliers.router import router as suppliers_router
 from app.reports.router import router as reports_router
 from app.audit.router import router as audit_router
+from app.metrics.router import router as metrics_router
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PARTITION_MAINTENANCE_ON_STARTUP:
+        # keep next months' partitions ready so rows never pile up in the default one
+        try:
+            with engine.begin() as conn:
+                ensure_audit_partitions(conn)
+                ensure_inventory_partitions(conn)
+        except Exception:
+            # the default partitions still take the rows; the next worker
+            # start or the ensure-partitions command retries
+            logger.exception("partition maintenance failed on startup")
+    if settings.AUDIT_MODE == AuditMode.BUFFERED:
+        audit_writer.start()
+    password_pool.start()
+    revocation_index.start()
+    yield
+    revocation_index.stop()
+    password_pool.stop()
+    # flush buffered audit rows before the worker exits
+    audit_writer.stop()
 
-app = FastAPI(title=settings.APP_NAME)
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 # ---- Rate limiting ----
 app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(RateLimitMiddleware)
 
 @app.exception_handler(RateLimitExceeded)
 def rate_limit_handler(request: Request, exc: RateLimitExceeded):
@@ -46,7 +82,8 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match", "If-Match"],
+    expose_headers=["X-Next-Cursor", "ETag"],
     max_age=600,
 )
 
@@ -57,4 +94,15 @@ app.include_router(products_router)
 app.include_router(inventory_router)
 app.include_router(suppliers_router)
 app.include_router(reports_router)
-app.include_router(audit_router)
\ No newline at end of file
+app.include_router(audit_router)
+app.include_router(metrics_router)
+
+# ---- Async routers (opt-in, served side by side with the sync ones) ----
+if settings.ASYNC_DB_ENABLED:
+    from app.inventory.async_router import router as async_inventory_router
+    from app.products.async_router import router as async_products_router
+    from app.reports.async_router import router as async_reports_router
+
+    app.include_router(async_inventory_router)
+    app.include_router(async_products_router)
+    app.include_router(async_reports_router)
\ No newline at end of file
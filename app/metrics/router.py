@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+
+from app.audit.writer import audit_writer
+from app.auth.revocation import revocation_index
+from app.core.cache import cache_stats
+from app.core.db_metrics import pool_stats
+from app.core.password_pool import password_pool
+from app.core.dependencies import require_role
+from app.common.enums import Role
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    dependencies=[
+        Depends(require_role([Role.ADMIN]))
+    ]
+)
+
+
+@router.get("/metrics")
+def metrics():
+    """Per-worker pool, cache, audit writer, password pool and revocation index counters; each uvicorn worker reports its own."""
+    return {
+        **pool_stats(),
+        "caches": cache_stats(),
+        "audit": audit_writer.stats(),
+        "password_pool": password_pool.stats(),
+        "revocations": revocation_index.stats(),
+    }
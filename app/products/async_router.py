@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.etag import not_modified_or_tag, row_etag, weak_etag
+from app.core.generations import table_generation_async
+from app.core.responses import row_dicts, rows_response
+from app.products.schemas import ProductOut, ProductList
+from app.products import async_service
+from app.core.dependencies import (
+    require_role,
+    pagination_params,
+    sorting_params,
+    total_mode_param,
+)
+from app.common.enums import Role, TotalMode
+from app.auth.service import get_current_user_async
+
+router = APIRouter(
+    prefix="/async/products",
+    tags=["Products (async)"],
+    dependencies=[Depends(require_role([Role.ADMIN], get_current_user_async))]
+)
+
+@router.get("/", response_model=ProductList)
+async def list_products(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    pagination: dict = Depends(pagination_params),
+    sorting: dict = Depends(sorting_params),
+    total_mode: TotalMode = Depends(total_mode_param),
+    search: str | None = Query(None),
+    category_id: int | None = Query(None),
+    name: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+):
+    etag = weak_etag("products", await table_generation_async(db, "products"))
+    not_modified = not_modified_or_tag(if_none_match, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = await async_service.get_products(
+        db,
+        page=pagination["page"],
+        page_size=pagination["page_size"],
+        offset=pagination["offset"],
+        sort_by=sorting["sort_by"],
+        sort_order=sorting["sort_order"],
+        total_mode=total_mode,
+        search=search,
+        category_id=category_id,
+        name=name,
+    )
+    page["items"] = row_dicts(page["items"], ProductOut)
+    return rows_response(page, headers=response.headers)
+
+@router.get("/{product_id}", response_model=ProductOut)
+async def retrieve_product(
+    product_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: str | None = Header(None),
+):
+    prod = await async_service.get_product(db, product_id)
+    if not prod:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return not_modified_or_tag(if_none_match, response, row_etag("product", prod)) or prod
@@ -0,0 +1,47 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.products import service
+from app.products.models import Product
+from app.products.schemas import ProductOut
+from app.common.enums import TotalMode
+from app.core.query_utils import paginate_offset_async
+from app.core.responses import schema_columns
+
+
+async def get_product(db: AsyncSession, product_id: int):
+    result = await db.execute(
+        select(Product).where(
+            Product.id == product_id,
+            Product.is_deleted == False
+        )
+    )
+    return result.scalars().first()
+
+
+async def get_products(
+    db: AsyncSession,
+    page: int,
+    page_size: int,
+    offset: int,
+    sort_by: str | None,
+    sort_order: str,
+    category_id: int | None = None,
+    name: str | None = None,
+    search: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+) -> dict:
+    """get_products(rows=True) on an AsyncSession: items are row tuples of ProductOut's columns."""
+    query = service.filter_products(
+        select(*schema_columns(Product, ProductOut)), sort_by, sort_order, category_id, name, search
+    )
+
+    items, total, has_next = await paginate_offset_async(db, query, offset, page_size, total_mode)
+
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "has_next": has_next,
+        "items": items,
+    }
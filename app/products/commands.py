@@ -0,0 +1,99 @@
+"""Benchmarks for the product catalog.
+
+Usage:
+    python -m app.products.commands bench-search [--products N] [--repeat N] [--total MODE]
+"""
+import argparse
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import app.db.base  # noqa: F401  (registers every model with the mapper)
+from app.common.enums import TotalMode
+from app.core.benchmark import format_timing, timed
+from app.core.database import SessionLocal
+from app.core.query_utils import paginate_offset
+from app.products.models import Product
+from app.products.service import filter_products
+
+SEED_PREFIX = "BENCH"
+
+# what a user types, keystroke by keystroke, plus a SKU and a miss
+SEARCH_TERMS = ["co", "copp", "copper", "copper wa", "copper washer", f"{SEED_PREFIX}-00123", "zzz"]
+
+
+def _seed_catalog(db: Session, products: int):
+    db.execute(text(
+        f"""
+        INSERT INTO products (name, sku, description, unit, min_quantity, is_deleted, price)
+        SELECT
+            (ARRAY['steel', 'copper', 'brass', 'nylon', 'rubber', 'oak', 'glass', 'zinc'])[1 + g % 8]
+                || ' ' || (ARRAY['washer', 'bolt', 'hinge', 'bracket', 'valve', 'spring', 'gasket'])[1 + g / 8 % 7]
+                || ' ' || g,
+            '{SEED_PREFIX}-' || lpad(g::text, 7, '0'),
+            'seeded for the search benchmark, batch ' || g % 1000,
+            'pc', 0, false, 1
+        FROM generate_series(1, :products) g
+        """
+    ), {"products": products})
+    db.execute(text("ANALYZE products"))
+
+
+def bench_search(
+    db: Session,
+    products: int = 500000,
+    repeat: int = 20,
+    total_mode: TotalMode = TotalMode.EXACT,
+) -> dict[str, dict]:
+    """Time the first page of /products/?search= against the name ILIKE it replaced.
+
+    Both compute total as total_mode says (the endpoint's default is
+    exact). The seeded catalog is rolled back afterwards.
+    """
+    def page(query):
+        return lambda: paginate_offset(query, 0, 20, total_mode)
+
+    try:
+        _seed_catalog(db, products)
+        results = {}
+        for term in SEARCH_TERMS:
+            served = filter_products(db.query(Product.id), None, "asc", search=term)
+            ilike = (
+                db.query(Product.id)
+                .filter(Product.is_deleted == False, Product.name.ilike(f"%{term}%"))
+                .order_by(Product.id)
+            )
+            results[term] = {
+                "matches": served.count(),
+                "served": timed(page(served), repeat),
+                "ilike": timed(page(ilike), repeat),
+            }
+        return results
+    finally:
+        db.rollback()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.products.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench-search", help="time catalog search against a name ILIKE on a seeded catalog")
+    bench.add_argument("--products", type=int, default=500000, help="number of seeded products")
+    bench.add_argument("--repeat", type=int, default=20, help="runs of each search")
+    bench.add_argument("--total", type=TotalMode, choices=list(TotalMode), default=TotalMode.EXACT)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        for term, result in bench_search(db, products=args.products, repeat=args.repeat, total_mode=args.total).items():
+            speedup = result["ilike"]["p50_ms"] / result["served"]["p50_ms"]
+            print(f"{term!r}: {result['matches']} matches, {speedup:.1f}x faster than ILIKE")
+            print(format_timing("  full-text and SKU prefix", result["served"]))
+            print(format_timing("  name ILIKE", result["ilike"]))
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
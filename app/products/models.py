@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Float, DateTime,Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Float, DateTime,Boolean, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
+from app.core.search import search_vector_sql
 
 class Product(Base):
     __tablename__ = "products"
@@ -17,3 +19,17 @@ class Product(Base):
     is_deleted = Column(Boolean, default=False)
     category = relationship("Category", backref="products")
     price = Column(Float, nullable=False)
+    # bumped on every ORM update; UPDATEs check it, and it is the row's ETag
+    version = Column(Integer, nullable=False, server_default="1")
+    # generated full-text document for search; never loaded with the row
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql(("name", "A"), ("sku", "A"), ("description", "B")), persisted=True),
+    ))
+
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # case-insensitive SKU prefix lookups (LIKE 'abc%') for type-ahead
+        Index("ix_products_sku_lower_prefix", text("lower(sku) text_pattern_ops")),
+    )
+    __mapper_args__ = {"version_id_col": version}
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.etag import not_modified_or_tag, row_etag, weak_etag
+from app.core.generations import table_generation
+from app.core.responses import row_dicts, rows_response
 from app.products.schemas import ProductCreate, ProductOut, ProductList,ProductUpdate
 from app.products.service import (
     create_product,
@@ -14,9 +17,10 @@ from app.core.dependencies import (
     require_role,
     pagination_params,
     sorting_params,
+    total_mode_param,
 
 )
-from app.common.enums import Role
+from app.common.enums import Role, TotalMode
 from app.users.models import User
 from app.auth.service import get_current_user
 
@@ -36,46 +40,69 @@ def create_prod(
 
 @router.get("/", response_model=ProductList)
 def list_products(
+    response: Response,
     db: Session = Depends(get_db),
     pagination: dict = Depends(pagination_params),
     sorting: dict = Depends(sorting_params),
+    total_mode: TotalMode = Depends(total_mode_param),
     search: str | None = Query(None),
     category_id: int | None = Query(None),
     name: str | None = Query(None),
+    if_none_match: str | None = Header(None),
 ):
-    return get_products(
+    # read before the page, so a write landing in between can only cost an extra fetch
+    etag = weak_etag("products", table_generation(db, "products"))
+    not_modified = not_modified_or_tag(if_none_match, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = get_products(
         db=db,
         page=pagination["page"],
         page_size=pagination["page_size"],
         offset=pagination["offset"],
         sort_by=sorting["sort_by"],
         sort_order=sorting["sort_order"],
+        total_mode=total_mode,
         search=search,
         category_id=category_id,
         name=name,
+        rows=True,
     )
+    page["items"] = row_dicts(page["items"], ProductOut)
+    return rows_response(page, headers=response.headers)
 
 @router.get("/{product_id}", response_model=ProductOut)
-def retrieve_product(product_id: int, db: Session = Depends(get_db)):
+def retrieve_product(
+    product_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: str | None = Header(None),
+):
     prod = get_product(db, product_id)
     if not prod:
         raise HTTPException(status_code=404, detail="Product not found")
-    return prod
+    return not_modified_or_tag(if_none_match, response, row_etag("product", prod)) or prod
 
 
 @router.patch("/{product_id}", response_model=ProductOut)
 def patch_product(
     product_id: int,
     data: ProductUpdate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    if_match: str | None = Header(None),
 ):
-    return update_product(db, product_id, data, current_user)
+    product = update_product(db, product_id, data, current_user, if_match=if_match)
+    response.headers["ETag"] = row_etag("product", product)
+    return product
 
 @router.delete("/{product_id}", response_model=ProductOut)
 def delete_prod(
     product_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    if_match: str | None = Header(None),
 ):
-    return delete_product(db, product_id, current_user)
+    return delete_product(db, product_id, current_user, if_match=if_match)
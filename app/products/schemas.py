@@ -25,9 +25,10 @@ class ProductOut(BaseModel):
         from_attributes = True
 
 class ProductList(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    has_next: bool
     items: List[ProductOut]
 
 
@@ -2,9 +2,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from fastapi import HTTPException
 from app.products.models import Product
-from app.products.schemas import ProductCreate
-from app.inventory.models import Inventory
-from app.core.query_utils import apply_pagination,apply_sorting
+from app.products.schemas import ProductCreate, ProductOut
+from app.inventory.models import Inventory, StockBalance
+from app.inventory.service import lock_stock_balance, update_low_stock
+from app.common.enums import TotalMode
+from app.core.query_utils import apply_sorting, paginate_offset
+from app.core.search import apply_text_search, escape_like
+from app.core.etag import check_if_match, flush_versioned, row_etag
+from app.core.responses import schema_columns
 from app.users.models import User
 from app.audit.service import log_action
 from fastapi.encoders import jsonable_encoder
@@ -20,8 +25,10 @@ def create_product(db: Session, data: ProductCreate, current_user: User):
 
     product = Product(**data.dict())
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    db.flush()
+    db.add(StockBalance(product_id=product.id, quantity=0))
+    db.flush()
+    update_low_stock(db, {product.id: 0}, {product.id: product.min_quantity})
 
     log_action(
     db=db,
@@ -32,44 +39,62 @@ def create_product(db: Session, data: ProductCreate, current_user: User):
     new_data=jsonable_encoder(data.dict())
 )
 
+    # product, balance and audit row commit together
+    db.commit()
+    db.refresh(product)
+
     return product
 
-def get_products(
-    db: Session,
-    page: int,
-    page_size: int,
-    offset: int,
+def filter_products(
+    query,
     sort_by: str | None,
     sort_order: str,
     category_id: int | None = None,
     name: str | None = None,
     search: str | None = None,
 ):
-    query = db.query(Product).filter(Product.is_deleted == False)
+    """Live products matching the list filters, in list order; query may be a Query or a select()."""
+    query = query.filter(Product.is_deleted == False)
 
     if category_id:
         query = query.filter(Product.category_id == category_id)
 
     if name:
-        query = query.filter(Product.name.ilike(f"%{name}%"))
+        query = query.filter(Product.name.ilike(f"%{escape_like(name)}%", escape="\\"))
 
+    rank = None
     if search:
-        query = query.filter(
-            Product.name.ilike(f"%{search}%")
-        )
+        query, rank = apply_text_search(query, Product.search_vector, search, prefix_column=Product.sku)
 
-    total = query.count()
+    if rank is not None and not sort_by:
+        query = query.order_by(rank.desc(), Product.id)
+    return apply_sorting(query, Product, sort_by, sort_order)
 
-    query = apply_sorting(query, Product, sort_by, sort_order)
 
-    query = apply_pagination(query, offset, page_size)
+def get_products(
+    db: Session,
+    page: int,
+    page_size: int,
+    offset: int,
+    sort_by: str | None,
+    sort_order: str,
+    category_id: int | None = None,
+    name: str | None = None,
+    search: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    # row tuples of ProductOut's columns instead of ORM objects, for rows_response
+    rows: bool = False,
+):
+    query = db.query(*schema_columns(Product, ProductOut)) if rows else db.query(Product)
+    query = filter_products(query, sort_by, sort_order, category_id, name, search)
 
-    items = query.all()
+    items, total, has_next = paginate_offset(query, offset, page_size, total_mode)
 
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
+        "has_next": has_next,
         "items": items,
     }
 
@@ -79,10 +104,11 @@ def get_product(db: Session, product_id: int):
         Product.is_deleted == False
     ).first()
 
-def update_product(db, product_id: int, data, current_user):
+def update_product(db, product_id: int, data, current_user, if_match: str | None = None):
     product = get_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    check_if_match(if_match, row_etag("product", product))
 
     payload = data.dict(exclude_unset=True)
 
@@ -109,9 +135,12 @@ def update_product(db, product_id: int, data, current_user):
 
     for key, value in payload.items():
         setattr(product, key, value)
+    flush_versioned(db, if_match)
 
-    db.commit()
-    db.refresh(product)
+    if "min_quantity" in payload:
+        balance = lock_stock_balance(db, product.id)
+        if balance is not None:
+            update_low_stock(db, {product.id: balance.quantity}, {product.id: product.min_quantity})
 
     log_action(
         db=db,
@@ -123,18 +152,23 @@ def update_product(db, product_id: int, data, current_user):
         new_data=jsonable_encoder(payload),
     )
 
+    db.commit()
+    db.refresh(product)
+
     return product
 
 def delete_product(
     db: Session,
     product_id: int,
-    current_user: User
+    current_user: User,
+    if_match: str | None = None,
 ):
 
     product = get_product(db, product_id)
 
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    check_if_match(if_match, row_etag("product", product))
 
     inventory_exists = db.query(Inventory).filter(
         Inventory.product_id == product_id
@@ -147,9 +181,8 @@ def delete_product(
         )
 
     product.is_deleted = True
-    db.commit()
-    db.refresh(product)
-    
+    flush_versioned(db, if_match)
+
     log_action(
     db=db,
     user_id=current_user.id,
@@ -160,4 +193,7 @@ def delete_product(
     new_data={"is_deleted": True}
 )
 
+    db.commit()
+    db.refresh(product)
+
     return product
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.core.database import get_async_db
+from app.reports.schemas import CurrentStockOut, LowStockOut
+from app.reports import async_service
+from app.reports.cache import cached_report_async
+from app.core.dependencies import require_role
+from app.auth.service import get_current_user_async
+from app.common.enums import Role
+
+router = APIRouter(
+    prefix="/async/reports",
+    tags=["reports (async)"],
+    dependencies=[
+        Depends(require_role([Role.ADMIN], get_current_user_async))
+    ]
+)
+@router.get("/current-stock", response_model=list[CurrentStockOut])
+async def current_stock(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await cached_report_async(
+        request, db, "current-stock", {}, lambda: async_service.current_stock_report(db)
+    )
+
+@router.get("/low-stock", response_model=list[LowStockOut])
+async def low_stock(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await cached_report_async(
+        request, db, "low-stock", {}, lambda: async_service.low_stock_report(db)
+    )
+
+@router.get("/inventory-range")
+async def inventory_range(request: Request, start: datetime, end: datetime, db: AsyncSession = Depends(get_async_db)):
+    return await cached_report_async(
+        request, db, "inventory-range", {"start": start, "end": end},
+        lambda: async_service.inventory_range_report(db, start, end),
+    )
+
+@router.get("/top-in")
+async def top_in(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await cached_report_async(
+        request, db, "top-in", {}, lambda: async_service.top_products_report(db, "IN")
+    )
+
+@router.get("/top-out")
+async def top_out(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await cached_report_async(
+        request, db, "top-out", {}, lambda: async_service.top_products_report(db, "OUT")
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.reports import service
+
+# Native AsyncSession versions of the report functions: same statements and
+# row shaping as app/reports/service.py, awaited on asyncpg.
+
+
+async def current_stock_report(db: AsyncSession):
+    return service.current_stock_rows((await db.execute(service.CURRENT_STOCK)).all())
+
+
+async def low_stock_report(db: AsyncSession):
+    return service.low_stock_rows((await db.execute(service.LOW_STOCK)).all())
+
+
+async def inventory_range_report(db: AsyncSession, start_date, end_date):
+    return service.inventory_range_rows(
+        [(await db.execute(statement)).one() for statement in service.inventory_range_statements(start_date, end_date)]
+    )
+
+
+async def top_products_report(db: AsyncSession, change_type: str):
+    return service.top_products_rows((await db.execute(service.top_products_statement(change_type))).all())
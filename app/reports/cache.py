@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import json
+import threading
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import make_cache
+from app.core.config import settings
+from app.core.etag import CACHE_CONTROL, etag_matches
+from app.reports.invalidation import GENERATION_SEQUENCE
+
+report_cache = make_cache(
+    "reports",
+    max_size=settings.REPORT_CACHE_MAX_SIZE,
+    ttl=settings.REPORT_CACHE_TTL_SECONDS,
+)
+
+
+# The generation is a Postgres sequence, so every worker sees the same value
+# whatever the cache backend. Reading it is one cheap statement, and nextval
+# takes no row lock, so concurrent writers never queue behind each other.
+# A fresh sequence reports last_value 1 both before and after its first
+# nextval; is_called tells the two apart.
+_READ_GENERATION = text(f"SELECT last_value + is_called::int FROM {GENERATION_SEQUENCE}")
+
+
+def generation(db: Session) -> int:
+    return db.execute(_READ_GENERATION).scalar()
+
+
+async def generation_async(db: AsyncSession) -> int:
+    return (await db.execute(_READ_GENERATION)).scalar()
+
+
+def _cache_key(generation: int, name: str, params: dict) -> str:
+    encoded = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+    return f"{generation}:{name}:{encoded}"
+
+
+def _entry(data) -> dict:
+    payload = jsonable_encoder(data)
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()[:32]
+    return {"etag": f'W/"{digest}"', "data": payload}
+
+
+def _response(request: Request, entry: dict) -> Response:
+    headers = {"ETag": entry["etag"], "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=json.dumps(entry["data"]),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# Single-flight: concurrent misses for the same key wait on one computation
+# instead of all running the same GROUP BY. Locks are per worker process.
+
+_flight_guard = threading.Lock()
+_flights: dict[str, threading.Lock] = {}
+_async_flights: dict[str, asyncio.Lock] = {}
+
+
+def cached_report(request: Request, db: Session, name: str, params: dict, compute) -> Response:
+    # read before computing, so an entry is never older than its generation
+    key = _cache_key(generation(db), name, params)
+    entry = report_cache.get(key)
+    if entry is None:
+        with _flight_guard:
+            lock = _flights.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                entry = report_cache.get(key, record_stats=False)
+                if entry is None:
+                    entry = _entry(compute())
+                    report_cache.set(key, entry)
+        finally:
+            with _flight_guard:
+                _flights.pop(key, None)
+    return _response(request, entry)
+
+
+async def cached_report_async(request: Request, db: AsyncSession, name: str, params: dict, compute) -> Response:
+    key = _cache_key(await generation_async(db), name, params)
+    entry = report_cache.get(key)
+    if entry is None:
+        lock = _async_flights.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = report_cache.get(key, record_stats=False)
+                if entry is None:
+                    entry = _entry(await compute())
+                    report_cache.set(key, entry)
+        finally:
+            _async_flights.pop(key, None)
+    return _response(request, entry)
@@ -0,0 +1,162 @@
+"""Benchmarks for the reports.
+
+Usage:
+    python -m app.reports.commands bench [--rows N] [--repeat N]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, func, select, text
+from sqlalchemy.orm import Session
+
+import app.db.base  # noqa: F401  (registers every model with the mapper)
+from app.common.enums import ChangeType
+from app.core.benchmark import format_timing, timed
+from app.core.database import SessionLocal
+from app.inventory.commands import refresh_daily_rollups, refresh_stock_balances, seed_ledger
+from app.inventory.models import Inventory
+from app.products.models import Product
+from app.reports.service import (
+    current_stock_report,
+    current_stock_rows,
+    inventory_range_report,
+    low_stock_report,
+    top_products_report,
+    top_products_rows,
+)
+
+# The reports as they were computed before the rollups: every one of them
+# aggregates the whole ledger.
+
+_LEDGER_STOCK = func.coalesce(
+    func.sum(case((Inventory.change_type == ChangeType.IN, Inventory.quantity), else_=-Inventory.quantity)),
+    0,
+)
+
+LEDGER_CURRENT_STOCK = (
+    select(
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        _LEDGER_STOCK.label("current_stock"),
+    )
+    .outerjoin(Inventory, Inventory.product_id == Product.id)
+    .group_by(Product.id, Product.name)
+)
+
+LEDGER_LOW_STOCK = LEDGER_CURRENT_STOCK.having(_LEDGER_STOCK < Product.min_quantity)
+
+
+def ledger_range_report(db: Session, start: datetime, end: datetime) -> list[dict]:
+    totals = {"IN": 0.0, "OUT": 0.0}
+    for change_type, total in db.execute(
+        select(Inventory.change_type, func.coalesce(func.sum(Inventory.quantity), 0))
+        .where(Inventory.created_at.between(start, end))
+        .group_by(Inventory.change_type)
+    ):
+        totals[change_type.value] = float(total)
+    return [{"change_type": key, "total_quantity": value} for key, value in totals.items()]
+
+
+def ledger_top_products(db: Session, change_type: ChangeType) -> list[dict]:
+    return top_products_rows(db.execute(
+        select(Product.name.label("product_name"), func.sum(Inventory.quantity).label("total_quantity"))
+        .join(Inventory, Inventory.product_id == Product.id)
+        .where(Inventory.change_type == change_type)
+        .group_by(Product.name)
+        .order_by(func.sum(Inventory.quantity).desc())
+        .limit(5)
+    ).all())
+
+
+def _report_pairs(db: Session) -> dict:
+    """Each report as (served from rollups and balances, computed from the ledger)."""
+    now = datetime.now(timezone.utc)
+    month = (now - timedelta(days=30), now)
+    year = (now - timedelta(days=365), now)
+    return {
+        "current_stock": (
+            lambda: current_stock_report(db),
+            lambda: current_stock_rows(db.execute(LEDGER_CURRENT_STOCK).all()),
+        ),
+        "low_stock": (
+            lambda: low_stock_report(db),
+            lambda: current_stock_rows(db.execute(LEDGER_LOW_STOCK).all()),
+        ),
+        "range_30_days": (
+            lambda: inventory_range_report(db, *month),
+            lambda: ledger_range_report(db, *month),
+        ),
+        "range_365_days": (
+            lambda: inventory_range_report(db, *year),
+            lambda: ledger_range_report(db, *year),
+        ),
+        "top_in": (
+            lambda: top_products_report(db, "IN"),
+            lambda: ledger_top_products(db, ChangeType.IN),
+        ),
+        "top_out": (
+            lambda: top_products_report(db, "OUT"),
+            lambda: ledger_top_products(db, ChangeType.OUT),
+        ),
+    }
+
+
+def _comparable(rows: list[dict]) -> list[tuple]:
+    # top products may break ties differently, so names are left out
+    return sorted(
+        (
+            r.get("product_id"),
+            r.get("change_type"),
+            round(r.get("current_stock", r.get("total_quantity")), 6),
+        )
+        for r in rows
+    )
+
+
+def bench_reports(db: Session, rows: int = 1000000, repeat: int = 5) -> dict[str, dict]:
+    """Time every report against its whole-ledger equivalent on a seeded ledger.
+
+    The seed rows, and the balances and rollups rebuilt for them, are
+    rolled back afterwards.
+    """
+    try:
+        seed_ledger(db, rows)
+        refresh_stock_balances(db)
+        refresh_daily_rollups(db)
+        db.execute(text("ANALYZE stock_balances, low_stock, inventory_daily_rollup"))
+        results = {}
+        for name, (served, ledger) in _report_pairs(db).items():
+            results[name] = {
+                "same": _comparable(served()) == _comparable(ledger()),
+                "served": timed(served, repeat),
+                "ledger": timed(ledger, repeat),
+            }
+        return results
+    finally:
+        db.rollback()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.reports.commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="time the reports against whole-ledger aggregation on a seeded ledger")
+    bench.add_argument("--rows", type=int, default=1000000, help="number of seeded ledger rows")
+    bench.add_argument("--repeat", type=int, default=5, help="runs of each report")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        results = bench_reports(db, rows=args.rows, repeat=args.repeat)
+        for name, result in results.items():
+            speedup = result["ledger"]["p50_ms"] / result["served"]["p50_ms"]
+            print(f"{'ok' if result['same'] else 'MISMATCH':<8} {name}: {speedup:.1f}x faster than the ledger scan")
+            print(format_timing("  rollups and balances", result["served"]))
+            print(format_timing("  ledger scan", result["ledger"]))
+        return 0 if all(r["same"] for r in results.values()) else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
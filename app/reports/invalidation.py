@@ -0,0 +1,69 @@
+"""Bump the report generation when inventory or product data changes.
+
+app.db.base imports this module, so the listeners are registered in every
+process that loads the models: the API workers and the commands alike.
+"""
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, object_session
+
+from app.inventory.models import Inventory, StockBalance, InventoryDailyRollup, LowStock
+from app.products.models import Product
+
+GENERATION_SEQUENCE = "report_generation"
+_BUMP_GENERATION = text(f"SELECT nextval('{GENERATION_SEQUENCE}')")
+
+_PENDING_KEY = "reports_stale"
+_WATCHED_TABLES = {
+    model.__table__
+    for model in (Inventory, StockBalance, InventoryDailyRollup, LowStock, Product)
+}
+
+
+# Inventory and product writes bump the generation once their transaction
+# commits, whether they go through the unit of work (add/flush) or through
+# bulk insert/update statements such as the batch and rollup upserts. The
+# bump runs on the connection that just committed, which the session still
+# holds during after_commit, so no second connection is checked out.
+
+def _mark_stale(session: Session, connection):
+    session.info[_PENDING_KEY] = connection
+
+
+def mark_reports_stale(db: Session):
+    """Bump the generation when db commits, for writes made with raw SQL the listeners cannot see."""
+    _mark_stale(db, db.connection())
+
+
+@event.listens_for(Inventory, "after_insert")
+@event.listens_for(StockBalance, "after_insert")
+@event.listens_for(StockBalance, "after_update")
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _mark_row_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _mark_stale(session, connection)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement(orm_execute_state):
+    state = orm_execute_state
+    if (state.is_insert or state.is_update or state.is_delete) and (
+        getattr(state.statement, "table", None) in _WATCHED_TABLES
+    ):
+        _mark_stale(state.session, state.session.connection())
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    connection = session.info.pop(_PENDING_KEY, None)
+    if connection is not None:
+        # nextval is not transactional: it sticks even though the session
+        # rolls this connection back when it releases it
+        connection.execute(_BUMP_GENERATION)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
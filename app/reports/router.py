@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.core.database import get_db
-from app.reports.schemas import CurrentStockOut
+from app.reports.schemas import CurrentStockOut, LowStockOut, LowStockEventPage
 from app.reports.service import (
     current_stock_report,
     low_stock_report,
+    low_stock_events,
     inventory_range_report,
     top_products_report
 )
+from app.reports.cache import cached_report
 from app.core.dependencies import require_role
-from app.common.enums import Role
+from app.common.enums import Role, LowStockEventType
 
 router = APIRouter(
     prefix="/reports",
@@ -20,21 +22,34 @@ router = APIRouter(
     ]
 )
 @router.get("/current-stock", response_model=list[CurrentStockOut])
-def current_stock(db: Session = Depends(get_db)):
-    return current_stock_report(db)
+def current_stock(request: Request, db: Session = Depends(get_db)):
+    return cached_report(request, db, "current-stock", {}, lambda: current_stock_report(db))
 
-@router.get("/low-stock")
-def low_stock(db: Session = Depends(get_db)):
-    return low_stock_report(db)
+@router.get("/low-stock", response_model=list[LowStockOut])
+def low_stock(request: Request, db: Session = Depends(get_db)):
+    return cached_report(request, db, "low-stock", {}, lambda: low_stock_report(db))
+
+@router.get("/low-stock/events", response_model=LowStockEventPage)
+def low_stock_event_feed(
+    after_id: int = Query(0, ge=0, description="Last event id already processed"),
+    limit: int = Query(100, ge=1, le=1000),
+    product_id: int | None = Query(None),
+    event: LowStockEventType | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    return low_stock_events(db, after_id=after_id, limit=limit, product_id=product_id, event=event)
 
 @router.get("/inventory-range")
-def inventory_range(start: datetime, end: datetime, db: Session = Depends(get_db)):
-    return inventory_range_report(db, start, end)
+def inventory_range(request: Request, start: datetime, end: datetime, db: Session = Depends(get_db)):
+    return cached_report(
+        request, db, "inventory-range", {"start": start, "end": end},
+        lambda: inventory_range_report(db, start, end),
+    )
 
 @router.get("/top-in")
-def top_in(db: Session = Depends(get_db)):
-    return top_products_report(db, "IN")
+def top_in(request: Request, db: Session = Depends(get_db)):
+    return cached_report(request, db, "top-in", {}, lambda: top_products_report(db, "IN"))
 
 @router.get("/top-out")
-def top_out(db: Session = Depends(get_db)):
-    return top_products_report(db, "OUT")
\ No newline at end of file
+def top_out(request: Request, db: Session = Depends(get_db)):
+    return cached_report(request, db, "top-out", {}, lambda: top_products_report(db, "OUT"))
@@ -1,6 +1,33 @@
+from datetime import datetime
 from pydantic import BaseModel
+from app.common.enums import LowStockEventType
 
 class CurrentStockOut(BaseModel):
     product_id: int
     product_name: str
-    current_stock: float
\ No newline at end of file
+    current_stock: float
+
+
+class LowStockOut(BaseModel):
+    product_id: int
+    product_name: str
+    current_stock: float
+    min_quantity: float | None
+    since: datetime
+
+
+class LowStockEventOut(BaseModel):
+    id: int
+    product_id: int
+    event: LowStockEventType
+    current_stock: float
+    min_quantity: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LowStockEventPage(BaseModel):
+    next_after_id: int
+    items: list[LowStockEventOut]
@@ -1,28 +1,31 @@
+from datetime import datetime, time, timedelta, timezone
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from app.inventory.models import Inventory
+from sqlalchemy import func, select
+from app.inventory.models import Inventory, StockBalance, InventoryDailyRollup, LowStock, LowStockEvent
 from app.products.models import Product
+from app.common.enums import ChangeType, LowStockEventType
 
-def current_stock_report(db: Session):
-    results = (
-        db.query(
-            Product.id.label("product_id"),
-            Product.name.label("product_name"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Inventory.change_type == "IN", Inventory.quantity),
-                        else_=-Inventory.quantity,
-                    )
-                ),
-                0
-            ).label("current_stock")
-        )
-        .outerjoin(Inventory, Inventory.product_id == Product.id)
-        .group_by(Product.id, Product.name)
-        .all()
+# Reports never aggregate the whole ledger: current stock comes from
+# stock_balances, low stock from the low_stock set and movement totals from
+# inventory_daily_rollup, with the raw ledger only read for the partial days
+# at the edges of a range.
+
+
+# Each report is a statement plus a function shaping its rows, so the sync
+# functions here and app/reports/async_service.py run the same SQL.
+
+CURRENT_STOCK = (
+    select(
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        func.coalesce(StockBalance.quantity, 0).label("current_stock")
     )
+    .outerjoin(StockBalance, StockBalance.product_id == Product.id)
+)
+
 
+def current_stock_rows(results) -> list[dict]:
     return [
         {
             "product_id": r.product_id,
@@ -32,88 +35,148 @@ def current_stock_report(db: Session):
         for r in results
     ]
 
-def low_stock_report(db: Session):
-    results = (
-        db.query(
-            Product.id.label("product_id"),
-            Product.name.label("product_name"),
-            Product.min_quantity,
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Inventory.change_type == "IN", Inventory.quantity),
-                        else_=-Inventory.quantity,
-                    )
-                ),
-                0
-            ).label("current_stock")
-        )
-        .outerjoin(Inventory, Inventory.product_id == Product.id)
-        .group_by(Product.id, Product.name, Product.min_quantity)
-        .having(
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Inventory.change_type == "IN", Inventory.quantity),
-                        else_=-Inventory.quantity,
-                    )
-                ),
-                0
-            ) < Product.min_quantity
-        )
-        .all()
+
+def current_stock_report(db: Session):
+    return current_stock_rows(db.execute(CURRENT_STOCK).all())
+
+
+LOW_STOCK = (
+    select(
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        Product.min_quantity,
+        StockBalance.quantity.label("current_stock"),
+        LowStock.since,
     )
+    .select_from(LowStock)
+    .join(Product, Product.id == LowStock.product_id)
+    .join(StockBalance, StockBalance.product_id == LowStock.product_id)
+    .order_by(LowStock.product_id)
+)
+
 
+def low_stock_rows(results) -> list[dict]:
     return [
         {
             "product_id": r.product_id,
             "product_name": r.product_name,
             "current_stock": float(r.current_stock),
             "min_quantity": r.min_quantity,
+            "since": r.since,
         }
         for r in results
     ]
 
-def inventory_range_report(db: Session, start_date, end_date):
-    results = (
-        db.query(
-            Inventory.change_type,
-            func.coalesce(func.sum(Inventory.quantity), 0).label("total_quantity")
-        )
-        .filter(Inventory.created_at.between(start_date, end_date))
-        .group_by(Inventory.change_type)
-        .all()
-    )
 
-    data = {"IN": 0, "OUT": 0}
+def low_stock_report(db: Session):
+    return low_stock_rows(db.execute(LOW_STOCK).all())
+
+
+def low_stock_events(
+    db: Session,
+    after_id: int = 0,
+    limit: int = 100,
+    product_id: int | None = None,
+    event: LowStockEventType | None = None,
+):
+    q = db.query(LowStockEvent).filter(LowStockEvent.id > after_id)
+    if product_id:
+        q = q.filter(LowStockEvent.product_id == product_id)
+    if event:
+        q = q.filter(LowStockEvent.event == event)
+
+    items = q.order_by(LowStockEvent.id).limit(limit).all()
 
-    for r in results:
-        data[r.change_type] = float(r.total_quantity)
+    return {
+        "items": items,
+        # unchanged when nothing new arrived, so pollers can always resend it
+        "next_after_id": items[-1].id if items else after_id,
+    }
 
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _midnight(day) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _ledger_totals(start: datetime, end: datetime, end_inclusive: bool):
+    upper = Inventory.created_at <= end if end_inclusive else Inventory.created_at < end
+    return select(
+        func.coalesce(func.sum(Inventory.quantity).filter(Inventory.change_type == ChangeType.IN), 0).label("in_qty"),
+        func.coalesce(func.sum(Inventory.quantity).filter(Inventory.change_type == ChangeType.OUT), 0).label("out_qty"),
+    ).where(Inventory.created_at >= start, upper)
+
+
+def inventory_range_statements(start_date, end_date) -> list:
+    """Statements whose single (in_qty, out_qty) rows add up to the report."""
+    start = _as_utc(start_date)
+    end = _as_utc(end_date)
+
+    # whole UTC days inside [start, end] come from the rollup table
+    first_full_day = start.date() if start == _midnight(start.date()) else start.date() + timedelta(days=1)
+    last_day = end.date()
+
+    if first_full_day >= last_day:
+        return [_ledger_totals(start, end, end_inclusive=True)]
+
+    statements = [
+        select(
+            func.coalesce(func.sum(InventoryDailyRollup.in_qty), 0).label("in_qty"),
+            func.coalesce(func.sum(InventoryDailyRollup.out_qty), 0).label("out_qty"),
+        ).where(
+            InventoryDailyRollup.day >= first_full_day,
+            InventoryDailyRollup.day < last_day,
+        )
+    ]
+    # partial days at both edges (the trailing one includes the current day)
+    if start < _midnight(first_full_day):
+        statements.append(_ledger_totals(start, _midnight(first_full_day), end_inclusive=False))
+    statements.append(_ledger_totals(_midnight(last_day), end, end_inclusive=True))
+    return statements
+
+
+def inventory_range_rows(totals) -> list[dict]:
     return [
-        {"change_type": key, "total_quantity": value}
-        for key, value in data.items()
+        {"change_type": "IN", "total_quantity": sum(float(t.in_qty) for t in totals)},
+        {"change_type": "OUT", "total_quantity": sum(float(t.out_qty) for t in totals)},
     ]
 
 
-def top_products_report(db: Session, change_type: str):
-    results = (
-        db.query(
+def inventory_range_report(db: Session, start_date, end_date):
+    return inventory_range_rows(
+        [db.execute(statement).one() for statement in inventory_range_statements(start_date, end_date)]
+    )
+
+
+def top_products_statement(change_type: str):
+    qty = InventoryDailyRollup.in_qty if change_type == "IN" else InventoryDailyRollup.out_qty
+    return (
+        select(
             Product.name.label("product_name"),
-            func.sum(Inventory.quantity).label("total_quantity")
+            func.sum(qty).label("total_quantity")
         )
-        .join(Inventory, Inventory.product_id == Product.id)
-        .filter(Inventory.change_type == change_type)
+        .join(InventoryDailyRollup, InventoryDailyRollup.product_id == Product.id)
         .group_by(Product.name)
-        .order_by(func.sum(Inventory.quantity).desc())
+        .having(func.sum(qty) > 0)
+        .order_by(func.sum(qty).desc())
         .limit(5)
-        .all()
     )
 
+
+def top_products_rows(results) -> list[dict]:
     return [
         {
             "product_name": r.product_name,
             "total_quantity": float(r.total_quantity),
         }
         for r in results
-    ]
\ No newline at end of file
+    ]
+
+
+def top_products_report(db: Session, change_type: str):
+    return top_products_rows(db.execute(top_products_statement(change_type)).all())
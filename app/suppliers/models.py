@@ -1,5 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text,Boolean
+from sqlalchemy import Column, Integer, String, Text,Boolean, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.core.database import Base
+from app.core.search import search_vector_sql
 
 class Supplier(Base):
     __tablename__ = "suppliers"
@@ -9,4 +12,17 @@ class Supplier(Base):
     contact = Column(String(100), nullable=True)
     address = Column(Text, nullable=True)
     is_deleted = Column(Boolean, default=False)
-    description = Column(String)
\ No newline at end of file
+    description = Column(String)
+    # bumped on every ORM update; UPDATEs check it, and it is the row's ETag
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # generated full-text document for search; never loaded with the row
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql(("name", "A"), ("description", "B")), persisted=True),
+    ))
+
+    __table_args__ = (
+        Index("ix_suppliers_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"version_id_col": version}
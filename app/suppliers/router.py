@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException,Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.suppliers.schemas import SupplierCreate, SupplierOut,SupplierList
+from app.core.etag import not_modified_or_tag, row_etag, weak_etag
+from app.core.generations import table_generation
+from app.core.responses import adapter_response
+from app.suppliers.schemas import SupplierCreate, SupplierOut,SupplierList, supplier_list_adapter
 from app.suppliers.service import create_supplier, get_suppliers, get_supplier, update_supplier, delete_supplier
-from app.core.dependencies import require_role,pagination_params,sorting_params
-from app.common.enums import Role
+from app.core.dependencies import require_role,pagination_params,sorting_params,total_mode_param
+from app.common.enums import Role, TotalMode
 
 router = APIRouter(
     prefix="/suppliers",
@@ -20,38 +23,65 @@ def add_supplier(data: SupplierCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=SupplierList)
 def list_suppliers(
+    response: Response,
     db: Session = Depends(get_db),
     pagination: dict = Depends(pagination_params),
     sorting: dict = Depends(sorting_params),
+    total_mode: TotalMode = Depends(total_mode_param),
     search: str | None = Query(None),
+    if_none_match: str | None = Header(None),
 ):
-    return get_suppliers(
+    # read before the page, so a write landing in between can only cost an extra fetch
+    etag = weak_etag("suppliers", table_generation(db, "suppliers"))
+    not_modified = not_modified_or_tag(if_none_match, response, etag)
+    if not_modified:
+        return not_modified
+
+    page = get_suppliers(
         db=db,
         page=pagination["page"],
         page_size=pagination["page_size"],
         offset=pagination["offset"],
         sort_by=sorting["sort_by"],
         sort_order=sorting["sort_order"],
+        total_mode=total_mode,
         search=search,
     )
+    return adapter_response(supplier_list_adapter, page, headers=response.headers)
 
 @router.get("/{supplier_id}", response_model=SupplierOut)
-def retrieve_supplier(supplier_id: int, db: Session = Depends(get_db)):
+def retrieve_supplier(
+    supplier_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: str | None = Header(None),
+):
     supplier = get_supplier(db, supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
-    return supplier
+    return not_modified_or_tag(if_none_match, response, row_etag("supplier", supplier)) or supplier
 
 @router.put("/{supplier_id}", response_model=SupplierOut)
-def update_supplier_router(supplier_id: int, data: SupplierCreate, db: Session = Depends(get_db)):
-    updated = update_supplier(db, supplier_id, data)
+def update_supplier_router(
+    supplier_id: int,
+    data: SupplierCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_match: str | None = Header(None),
+):
+    updated = update_supplier(db, supplier_id, data, if_match=if_match)
     if not updated:
         raise HTTPException(status_code=404, detail="Supplier not found")
+    response.headers["ETag"] = row_etag("supplier", updated)
     return updated
 
 @router.delete("/{supplier_id}", response_model=SupplierOut)
-def delete_supplier_router(supplier_id: int, db: Session = Depends(get_db)):
-    deleted = delete_supplier(db, supplier_id)
+def delete_supplier_router(
+    supplier_id: int,
+    db: Session = Depends(get_db),
+    if_match: str | None = Header(None),
+):
+    deleted = delete_supplier(db, supplier_id, if_match=if_match)
     if not deleted:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return deleted
\ No newline at end of file
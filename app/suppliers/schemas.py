@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional,List
 
 class SupplierCreate(BaseModel):
@@ -16,7 +16,11 @@ class SupplierOut(BaseModel):
         from_attributes = True
 
 class SupplierList(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    items: List[SupplierOut]
\ No newline at end of file
+    has_next: bool
+    items: List[SupplierOut]
+
+
+supplier_list_adapter = TypeAdapter(SupplierList)
@@ -2,8 +2,10 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.suppliers.models import Supplier
 from app.suppliers.schemas import SupplierCreate
-from sqlalchemy import or_
-from app.core.query_utils import apply_pagination,apply_sorting
+from app.common.enums import TotalMode
+from app.core.query_utils import apply_sorting, paginate_offset
+from app.core.search import apply_text_search
+from app.core.etag import check_if_match, flush_versioned, row_etag
 
 def create_supplier(db: Session, data: SupplierCreate):
     existing = db.query(Supplier).filter(
@@ -29,29 +31,25 @@ def get_suppliers(
     sort_by: str | None,
     sort_order: str,
     search: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
 ):
     query = db.query(Supplier).filter(Supplier.is_deleted == False)
 
+    rank = None
     if search:
-        query = query.filter(
-            or_(
-                Supplier.name.ilike(f"%{search}%"),
-                Supplier.description.ilike(f"%{search}%"),
-            )
-        )
-
-    total = query.count()
+        query, rank = apply_text_search(query, Supplier.search_vector, search)
 
+    if rank is not None and not sort_by:
+        query = query.order_by(rank.desc(), Supplier.id)
     query = apply_sorting(query, Supplier, sort_by, sort_order)
 
-    query = apply_pagination(query, offset, page_size)
-
-    items = query.all()
+    items, total, has_next = paginate_offset(query, offset, page_size, total_mode)
 
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
+        "has_next": has_next,
         "items": items,
     }
 
@@ -60,23 +58,27 @@ def get_suppliers(
 def get_supplier(db: Session, supplier_id: int):
     return db.query(Supplier).filter(Supplier.id == supplier_id).first()
 
-def update_supplier(db: Session, supplier_id: int, data: SupplierCreate):
+def update_supplier(db: Session, supplier_id: int, data: SupplierCreate, if_match: str | None = None):
     supplier = get_supplier(db, supplier_id)
     if not supplier:
         return None
+    check_if_match(if_match, row_etag("supplier", supplier))
     for key, value in data.dict().items():
         setattr(supplier, key, value)
+    flush_versioned(db, if_match)
     db.commit()
     db.refresh(supplier)
     return supplier
 
-def delete_supplier(db: Session, supplier_id: int):
+def delete_supplier(db: Session, supplier_id: int, if_match: str | None = None):
     supplier = get_supplier(db, supplier_id)
 
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
+    check_if_match(if_match, row_etag("supplier", supplier))
 
     supplier.is_deleted = True
+    flush_versioned(db, if_match)
     db.commit()
     db.refresh(supplier)
 